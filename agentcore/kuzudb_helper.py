@@ -1,5 +1,26 @@
 from config import app_config
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retry transient failures (connection resets, 429/5xx) with jittered exponential backoff;
+# other 4xx answers are final and returned as-is
+_retry = Retry(
+    total=3,
+    backoff_factor=1.0,
+    backoff_jitter=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# One keep-alive pool for every call to the ATLAS app, instead of a new connection per request
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=_retry)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+_session.verify = False
 
 def get_skill_prerequisites_by_name(skill_name):
     """
@@ -10,7 +31,7 @@ def get_skill_prerequisites_by_name(skill_name):
     url = f"{app_config.atlas_app_url}/api/skills/{skill_name}/prerequisites"
     print(url, "url")
     print(app_config.atlas_app_url, "app_config.atlas_app_url")
-    response = requests.get(url, verify=False)
+    response = _session.get(url)
     print(response, "response")
     response_json = response.json()
     if response.status_code == 200:
@@ -29,7 +50,7 @@ def find_learning_path(start_skill, target_skill):
     print(app_config.atlas_app_url, "app_config.atlas_app_url")
     url = f"{app_config.atlas_app_url}/api/skill-path?start={start_skill}&end={target_skill}"
     print(url, "url")
-    response = requests.get(url, verify=False)
+    response = _session.get(url)
     print(response, "response")
     response_json = response.json()
     print(response_json, "response_json")
@@ -22,44 +22,35 @@ from __future__ import annotations
 
 import os
 import json
+import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
 from dotenv import load_dotenv
 load_dotenv()  # take environment variables from .env.
 
 from langchain_litellm import ChatLiteLLM
-from langchain.schema import (
-    SystemMessage,
-    HumanMessage,
-    AIMessage,
-)
+from llm._msgbuild import build_messages
+
+logger = logging.getLogger(__name__)
 
 api_key = os.getenv("LITELLM_API_KEY")
 api_base = os.getenv("LITELLM_API_BASE")
 llm_provider = os.getenv("LITELLM_LLM_PROVIDER")
 
-def chat_completions(messages: list[dict], system_prompt: Optional[str], model: str = "falcon3-1b"):
-    llm = ChatLiteLLM(model=model, 
+@lru_cache(maxsize=32)
+def _get_llm(model: str, api_base: Optional[str], api_key: Optional[str], llm_provider: Optional[str]) -> ChatLiteLLM:
+    """ChatLiteLLM built once per settings so repeated calls keep their connections."""
+    return ChatLiteLLM(model=model, 
 	api_base=api_base, 
 	api_key=api_key, custom_llm_provider=llm_provider)
 
-    chat_messages=[]
-
-    # Add system message if provided
-    if system_prompt:
-        chat_messages.append(SystemMessage(content=system_prompt))
-    
-    for msg in messages:
-        if "ai" in msg and msg["ai"]:
-            chat_messages.append(AIMessage(content=msg["ai"]))
-        # Add user message
-        if "user" in msg and msg["user"]:
-            chat_messages.append(HumanMessage(content=msg["user"]))
-    
+def chat_completions(messages: list[dict], system_prompt: Optional[str], model: str = "falcon3-1b"):
+    llm = _get_llm(model, api_base, api_key, llm_provider)
 
     # Send the message to the model
-    response = llm.invoke(chat_messages)
-    print("LLM response:", response.content)
+    response = llm.invoke(build_messages(messages, system_prompt))
+    logger.debug("LLM response: %s", response.content)
     return response
 
 
@@ -1,48 +1,82 @@
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI, HTTPException, Query, Body, Header, Depends
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi import FastAPI, HTTPException, Query, Body, Header, Depends, Request
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
 from helper.kuzu_db_helper import KuzuSkillGraph
+from helper.cache import TTLCache
+from helper.roadmap_helper import get_cached_roadmap_progression
 from agents.personalized_route_planning_agent import PersonalizedRoutePlanningAgent
-from helper.pocketbase_helper import get_pb_admin_client
+from helper.user_progress_helper import get_progress_helper
 import deps
 from config import app_config
 
 from routes.users import router as users_router
 from routes.roadmap_progress import router as roadmap_progress_router
 from routes.learning_map import router as learning_map_router
+from routes.roadmap import router as roadmap_router
 from routes.notes import router as notes_router
 from routes.agent import router as agent_router
 
+import logging
 import os
+import sys
 from dotenv import load_dotenv
 load_dotenv()
 
+logging.basicConfig(level=app_config.log_level)
+logger = logging.getLogger(__name__)
+# Config is read before logging is configured, so report its values from here
+logger.debug("model=%s", app_config.model)
 
-app = FastAPI(title="AI Learning Subway Map", description="Multi-user AI Learning Path Visualization")
+app = FastAPI(
+    title="AI Learning Subway Map",
+    description="Multi-user AI Learning Path Visualization",
+    default_response_class=ORJSONResponse,
+)
 
 # Initialize shared Kuzu manager and agent in startup events to avoid multi-process locks
 @app.on_event("startup")
 def on_startup():
+    # Chat responses keyed by hashed (model, message); see routes/learning_map.py
+    app.state.llm_cache = TTLCache(maxsize=2048, ttl=3600)
+    deps.warm_templates()
+    deps.open_pb_http()
     try:
         app.state.kuzu_manager = KuzuSkillGraph("skills_graph.db")
         deps.kuzu_manager = app.state.kuzu_manager
         app.state.agent = PersonalizedRoutePlanningAgent(kuzu_helper=app.state.kuzu_manager)
-        print("✅ LangGraph agent initialized successfully")
+        logger.info("LangGraph agent initialized successfully")
     except Exception as e:
-        print(f"❌ Failed to initialize LangGraph agent: {e}")
+        logger.error("Failed to initialize LangGraph agent: %s", e)
         app.state.agent = None
+    try:
+        # Authenticate the admin client and build the shared progress helper up front
+        get_progress_helper()
+    except Exception as e:
+        logger.warning("Could not initialize progress helper: %s", e)
+    try:
+        # Warm the roadmap progression payload (and the all-skills cache it reads); rebuilt when the graph version changes
+        get_cached_roadmap_progression(app.state, app.state.kuzu_manager)
+    except Exception as e:
+        logger.warning("Could not warm roadmap caches: %s", e)
 
 @app.on_event("shutdown")
-def on_shutdown():
+async def on_shutdown():
     try:
         if hasattr(app.state, "kuzu_manager") and app.state.kuzu_manager:
             app.state.kuzu_manager.close()
     except Exception:
         pass
+    await deps.close_pb_http()
+    # Groq's shared HTTP clients only exist if the Groq client was ever loaded
+    groq_module = sys.modules.get("llm.groq")
+    if groq_module is not None:
+        await groq_module.close_http_clients()
 
 # Add CORS middleware
 app.add_middleware(
@@ -53,6 +87,9 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers (including X-API-Key)
 )
 
+# Compress larger responses (the Cytoscape roadmap payloads are highly repetitive JSON)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Mount static files with prefix
 if app_config.url_prefix:
     static_prefix = f"{app_config.url_prefix}/static"
@@ -60,6 +97,13 @@ else:
     static_prefix = "/static"
 app.mount(static_prefix, StaticFiles(directory="static"), name="static")
 
+# Unhandled errors: log once with the traceback and return a generic 500
+# (HTTPException raises carrying a business status code are handled by FastAPI as usual)
+@app.exception_handler(Exception)
+async def on_unhandled_error(request: Request, exc: Exception):
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
+
 # Health check endpoint
 @app.get("/health")
 def health_check():
@@ -68,10 +112,11 @@ def health_check():
 
 # Include routers with prefix
 prefix = app_config.url_prefix if app_config.url_prefix else ""
-print(prefix, "prefix")
+logger.debug("url_prefix=%r", prefix)
 app.include_router(users_router, prefix=prefix)
 app.include_router(roadmap_progress_router, prefix=prefix)
 app.include_router(learning_map_router, prefix=prefix)
+app.include_router(roadmap_router, prefix=prefix)
 app.include_router(notes_router, prefix=prefix)
 app.include_router(agent_router, prefix=prefix)
 
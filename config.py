@@ -1,6 +1,5 @@
 import os
 from dotenv import load_dotenv
-from pocketbase import PocketBase
 
 load_dotenv()
 
@@ -14,7 +13,6 @@ class Config:
         self.aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
         self.aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
         self.model = os.getenv("MODEL")
-        print(self.model, "self.model")
         self.agent_runtime_arn = os.getenv("AGENT_RUNTIME_ARN")
         
         # PocketBase configuration
@@ -28,18 +26,15 @@ class Config:
         if url_prefix and not url_prefix.startswith("/"):
             url_prefix = "/" + url_prefix
         self.url_prefix = url_prefix
-        print(self.url_prefix, "self.url_prefix")
-        
-        # # Initialize PocketBase connection
-        # self.pb = None
-        # if self.pocketbase_url and self.pocketbase_email and self.pocketbase_password:
-        #     self.pb = PocketBase(self.pocketbase_url)
-        #     try:
-        #         self.pb.admins.auth_with_password(self.pocketbase_email, self.pocketbase_password)
-        #         print("Connected to PocketBase with admin credentials")
-        #     except Exception as e:
-        #         print(f"Warning: Could not connect to PocketBase: {e}")
-        #         self.pb = None
+
+        # Root log level (DEBUG logs the model and URL prefix at startup)
+        self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+
+        # On-disk cache for temperature-0 LLM responses (disabled when empty)
+        self.llm_cache_path = os.getenv("LLM_CACHE_PATH", "")
+
+        # Re-check template files for changes on every render (enable for local development)
+        self.template_auto_reload = os.getenv("TEMPLATE_AUTO_RELOAD", "false").lower() == "true"
 
 
 app_config = Config()
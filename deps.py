@@ -1,13 +1,67 @@
+import os
+import tempfile
+import httpx
 from fastapi.templating import Jinja2Templates
-from helper.pocketbase_helper import get_pb_admin_client
+from jinja2 import FileSystemBytecodeCache
+from fastapi.responses import HTMLResponse
 from config import app_config
+from helper.cache import TTLCache
 
 # Shared dependencies across the app
-# pb = get_pb_admin_client()
 templates = Jinja2Templates(directory="templates")
+# Share compiled template bytecode across workers/restarts; skip mtime checks unless asked for
+_jinja_cache_dir = os.path.join(tempfile.gettempdir(), "atlas_jinja_cache")
+os.makedirs(_jinja_cache_dir, exist_ok=True)
+templates.env.bytecode_cache = FileSystemBytecodeCache(_jinja_cache_dir)
+templates.env.auto_reload = app_config.template_auto_reload
 
 # Will be populated on startup from app.py
 kuzu_manager = None
+# user_id -> {view: payload} for the progress read endpoints; dropped on every progress write
+progress_cache = TTLCache(maxsize=4096, ttl=300)
+# Cap on cached views per user; node views are keyed by a client-supplied path id
+MAX_PROGRESS_VIEWS = 32
+
+
+def progress_views(user_id: str) -> dict:
+    """Cached progress views for a user; a write drops the dict, so late reads can't repopulate it."""
+    views = progress_cache.get(user_id)
+    if views is None:
+        views = {}
+        progress_cache.set(user_id, views)
+    return views
+
+
+def store_progress_view(views: dict, key, value):
+    """Cache a progress view unless the user's dict is already full."""
+    if key in views or len(views) < MAX_PROGRESS_VIEWS:
+        views[key] = value
+
+
+def invalidate_progress(user_id: str):
+    progress_cache.pop(user_id)
+
+# Shared async HTTP client for PocketBase REST calls (keep-alive pool); opened/closed by app.py
+pb_http = None
+
+def open_pb_http() -> httpx.AsyncClient:
+    """Create the shared PocketBase HTTP client."""
+    global pb_http
+    pb_http = httpx.AsyncClient(
+        base_url=app_config.pocketbase_url or "",
+        timeout=5.0,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=64),
+        verify=False,
+    )
+    return pb_http
+
+async def close_pb_http():
+    """Close the shared PocketBase HTTP client."""
+    global pb_http
+    if pb_http is not None:
+        await pb_http.aclose()
+        pb_http = None
 
 # URL helper functions for templates
 def url_for_with_prefix(path: str) -> str:
@@ -33,4 +87,33 @@ templates.env.globals.update({
     'url_prefix': app_config.url_prefix
 })
 
+# Content-only templates returned on HTMX navigation; compiled once at startup
+PARTIAL_TEMPLATES = (
+    "notes_content.html",
+    "roadmaps_content.html",
+    "settings_content.html",
+    "skills_content.html",
+    "profile_content.html",
+)
+# Full pages rendered on every navigation/refresh
+PAGE_TEMPLATES = (
+    "base.html",
+    "skills_graph.html",
+    "learning_path.html",
+    "roadmap_progression.html",
+    "auth/login.html",
+    "auth/signup.html",
+)
+_compiled_templates = {}
+
+def warm_templates(names=PARTIAL_TEMPLATES + PAGE_TEMPLATES):
+    """Compile templates ahead of the first request."""
+    for name in names:
+        _compiled_templates[name] = templates.get_template(name)
 
+def render_template(name: str, context: dict) -> HTMLResponse:
+    """Render a precompiled template straight to an HTMLResponse, skipping the loader lookup."""
+    template = _compiled_templates.get(name)
+    if template is None:
+        template = _compiled_templates[name] = templates.get_template(name)
+    return HTMLResponse(template.render(context))
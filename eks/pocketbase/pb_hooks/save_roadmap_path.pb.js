@@ -0,0 +1,59 @@
+/// <reference path="../pb_data/types.d.ts" />
+
+// Saves a user's roadmap path in one request and one transaction:
+// roadmap (by name) -> roadmap path (by skill_sequence_hash) -> path skills -> user mapping.
+// Called by UserProgressHelper.save_user_roadmap_path with a superuser token.
+routerAdd("POST", "/api/atlas/roadmap-paths", (e) => {
+  const body = e.requestInfo().body;
+
+  // Handlers run in isolated scopes, so helpers live inside the handler
+  const findFirst = (app, collection, filter, params) => {
+    try {
+      return app.findFirstRecordByFilter(collection, filter, params);
+    } catch (_) {
+      return null;
+    }
+  };
+  const create = (app, collection, data) => {
+    const record = new Record(app.findCollectionByNameOrId(collection));
+    for (const key in data) {
+      record.set(key, data[key]);
+    }
+    app.save(record);
+    return record;
+  };
+
+  let result = null;
+  e.app.runInTransaction((txApp) => {
+    let roadmapPath = findFirst(txApp, "roadmap_paths", "skill_sequence_hash = {:hash}", { hash: body.skill_sequence_hash });
+    if (!roadmapPath) {
+      const roadmap = findFirst(txApp, "roadmaps", "name = {:name}", { name: body.roadmap_name })
+        || create(txApp, "roadmaps", { name: body.roadmap_name, description: body.roadmap_description });
+      roadmapPath = create(txApp, "roadmap_paths", {
+        name: body.path_name,
+        roadmap_id: roadmap.id,
+        skill_sequence_hash: body.skill_sequence_hash,
+        description: body.path_description,
+      });
+      for (const skill of body.skills || []) {
+        create(txApp, "roadmap_path_skills", {
+          roadmap_path_id: roadmapPath.id,
+          skill_id: skill.skill_id,
+          order_index: skill.order_index,
+          learning_nodes_count: skill.learning_nodes_count,
+        });
+      }
+    }
+
+    const userPath = findFirst(txApp, "user_roadmap_path", "user_id = {:user} && roadmap_path_id = {:path}", { user: body.user_id, path: roadmapPath.id })
+      || create(txApp, "user_roadmap_path", { user_id: body.user_id, roadmap_path_id: roadmapPath.id, progress: 0 });
+
+    result = {
+      roadmap_id: roadmapPath.get("roadmap_id"),
+      roadmap_path_id: roadmapPath.id,
+      user_roadmap_path_id: userPath.id,
+    };
+  });
+
+  return e.json(200, result);
+}, $apis.requireSuperuserAuth());
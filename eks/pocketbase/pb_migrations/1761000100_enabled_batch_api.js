@@ -0,0 +1,12 @@
+/// <reference path="../pb_data/types.d.ts" />
+// The app sends grouped record writes through POST /api/batch (disabled by default)
+migrate((app) => {
+  const settings = app.settings();
+  settings.batch.enabled = true;
+  settings.batch.maxRequests = 50;
+  app.save(settings);
+}, (app) => {
+  const settings = app.settings();
+  settings.batch.enabled = false;
+  app.save(settings);
+})
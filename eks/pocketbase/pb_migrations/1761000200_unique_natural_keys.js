@@ -0,0 +1,99 @@
+/// <reference path="../pb_data/types.d.ts" />
+// Unique natural keys so writes can insert first and treat a 400 as "already exists"
+// (replaces the plain indexes on the same columns from 1761000000_added_progress_indexes.js).
+// Rows that already collide are merged first, otherwise CREATE UNIQUE INDEX fails and
+// PocketBase refuses to start.
+const INDEXES = {
+  "pbc_2719533596": [
+    "CREATE UNIQUE INDEX `idx_lnp_path_node` ON `user_learning_node_progress` (`user_roadmap_path_id`, `learning_node_id`)",
+    "CREATE INDEX `idx_lnp_path_skill` ON `user_learning_node_progress` (`user_roadmap_path_id`, `skill_id`)",
+    "CREATE INDEX `idx_lnp_done` ON `user_learning_node_progress` (`user_roadmap_path_id`) WHERE `completed_at` != ''"
+  ],
+  "pbc_2944177148": [
+    "CREATE UNIQUE INDEX `idx_urp_user_path` ON `user_roadmap_path` (`user_id`, `roadmap_path_id`)"
+  ],
+  "pbc_3258806628": [
+    "CREATE UNIQUE INDEX `idx_rp_sequence_hash` ON `roadmap_paths` (`skill_sequence_hash`) WHERE `skill_sequence_hash` != ''"
+  ],
+  "pbc_2140665690": [
+    "CREATE UNIQUE INDEX `idx_roadmaps_name` ON `roadmaps` (`name`) WHERE `name` != ''"
+  ]
+};
+
+const PREVIOUS = {
+  "pbc_2719533596": [
+    "CREATE INDEX `idx_lnp_path_node` ON `user_learning_node_progress` (`user_roadmap_path_id`, `learning_node_id`)",
+    "CREATE INDEX `idx_lnp_path_skill` ON `user_learning_node_progress` (`user_roadmap_path_id`, `skill_id`)",
+    "CREATE INDEX `idx_lnp_done` ON `user_learning_node_progress` (`user_roadmap_path_id`) WHERE `completed_at` != ''"
+  ],
+  "pbc_2944177148": [
+    "CREATE INDEX `idx_urp_user_path` ON `user_roadmap_path` (`user_id`, `roadmap_path_id`)"
+  ],
+  "pbc_3258806628": [
+    "CREATE INDEX `idx_rp_sequence_hash` ON `roadmap_paths` (`skill_sequence_hash`)"
+  ],
+  "pbc_2140665690": []
+};
+
+// Parents before children: merging a parent repoints its children, which can make them collide in turn.
+// For each group the first row by `keep` survives; `repoint` references are moved onto it and
+// `drop` references (the duplicate's own copy of data the survivor already has) are deleted.
+const DUPLICATES = [
+  {
+    table: "roadmaps", key: ["name"], keep: "created, id",
+    repoint: [["roadmap_paths", "roadmap_id"]], drop: []
+  },
+  {
+    table: "roadmap_paths", key: ["skill_sequence_hash"], keep: "created, id",
+    repoint: [["user_roadmap_path", "roadmap_path_id"]], drop: [["roadmap_path_skills", "roadmap_path_id"]]
+  },
+  {
+    // Keep the furthest-along copy of a user's path
+    table: "user_roadmap_path", key: ["user_id", "roadmap_path_id"], keep: "progress DESC, created, id",
+    repoint: [["user_learning_node_progress", "user_roadmap_path_id"]], drop: []
+  },
+  {
+    // Prefer the completed row when a node was recorded twice
+    table: "user_learning_node_progress", key: ["user_roadmap_path_id", "learning_node_id"],
+    keep: "`completed_at` = '', created, id", repoint: [], drop: []
+  }
+];
+
+function mergeDuplicates(app, { table, key, keep, repoint, drop }) {
+  const run = (sql) => app.db().newQuery(sql).execute();
+  const keyList = key.map((column) => "`" + column + "`").join(", ");
+  const nonEmpty = key.map((column) => "`" + column + "` != ''").join(" AND ");
+
+  // Map every non-surviving row to the id of the row it merges into
+  run("DROP TABLE IF EXISTS `_merge_map`");
+  run(
+    "CREATE TEMP TABLE `_merge_map` AS SELECT `id`, `keep_id` FROM (" +
+    "SELECT `id`, FIRST_VALUE(`id`) OVER (PARTITION BY " + keyList + " ORDER BY " + keep + ") AS `keep_id` " +
+    "FROM `" + table + "` WHERE " + nonEmpty + ") WHERE `id` != `keep_id`"
+  );
+  for (const [child, column] of repoint) {
+    run(
+      "UPDATE `" + child + "` SET `" + column + "` = " +
+      "(SELECT `keep_id` FROM `_merge_map` WHERE `_merge_map`.`id` = `" + child + "`.`" + column + "`) " +
+      "WHERE `" + column + "` IN (SELECT `id` FROM `_merge_map`)"
+    );
+  }
+  for (const [child, column] of drop) {
+    run("DELETE FROM `" + child + "` WHERE `" + column + "` IN (SELECT `id` FROM `_merge_map`)");
+  }
+  run("DELETE FROM `" + table + "` WHERE `id` IN (SELECT `id` FROM `_merge_map`)");
+  run("DROP TABLE `_merge_map`");
+}
+
+function applyIndexes(app, indexesById) {
+  for (const [collectionId, indexes] of Object.entries(indexesById)) {
+    const collection = app.findCollectionByNameOrId(collectionId);
+    unmarshal({ "indexes": indexes }, collection);
+    app.save(collection);
+  }
+}
+
+migrate((app) => {
+  DUPLICATES.forEach((group) => mergeDuplicates(app, group));
+  applyIndexes(app, INDEXES);
+}, (app) => applyIndexes(app, PREVIOUS))
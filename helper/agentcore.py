@@ -1,22 +1,31 @@
+import asyncio
 import boto3
 import json
+import logging
 from config import app_config
 
+logger = logging.getLogger(__name__)
+
 client = boto3.client('bedrock-agentcore', region_name='us-east-2')
 
-async def invoke_agent_runtime(user_message: str, session_id: str):
-    payload = json.dumps({
-        "user_message": user_message
-    })
-    print(app_config.agent_runtime_arn, "app_config.agent_runtime_arn")
+def _invoke_agent_runtime_sync(payload: str, session_id: str):
+    """Blocking boto3 call to AgentCore; run via asyncio.to_thread from async code."""
     response = client.invoke_agent_runtime(
         agentRuntimeArn=app_config.agent_runtime_arn,
         runtimeSessionId=session_id,  # Must be 33+ chars
         payload=payload,
         qualifier="DEFAULT" # Optional
     )
-    print(response, "response")
+    logger.debug("AgentCore response: %s", response)
     response_body = response['response'].read()
-    response_data = json.loads(response_body)
-    print(response_data, "response_data")
-    return response_data
\ No newline at end of file
+    return json.loads(response_body)
+
+async def invoke_agent_runtime(user_message: str, session_id: str):
+    payload = json.dumps({
+        "user_message": user_message
+    })
+    logger.debug("Invoking AgentCore runtime %s", app_config.agent_runtime_arn)
+    # boto3 is synchronous; keep the event loop free while AgentCore runs the graph
+    response_data = await asyncio.to_thread(_invoke_agent_runtime_sync, payload, session_id)
+    logger.debug("AgentCore response data: %s", response_data)
+    return response_data
@@ -1,81 +1,91 @@
-import json
+import mmap
 import os
 import re
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+import orjson
+
+# Compiled once; content files are scanned as bytes straight from an mmap
+_RESOURCE_RE = re.compile(rb'- \[@(\w+)@([^\]]+)\]\(([^)]+)\)')
+_DASH_RE = re.compile(r'-+')
+_NONALPHA_RE = re.compile(r'[^a-zA-Z\s]')
+_WS_RE = re.compile(r'\s+')
+# Resource intro variants; search() returns the earliest one in a single pass
+_RESOURCE_MARKERS = (
+    "Visit the following resources",
+    "To learn more, visit the following links",
+    "Learn more from the following resources",
+)
+_MARKER_RE = re.compile(b"|".join(re.escape(marker.encode()) for marker in _RESOURCE_MARKERS))
+# Map resource types to our schema (keys are raw bytes from _RESOURCE_RE)
+_TYPE_MAPPING = {
+    b'official': 'course',
+    b'article': 'article',
+    b'opensource': 'tutorial',
+    b'video': 'video',
+    b'guide': 'guide',
+    b'course': 'course'
+}
 
 def collapse_dashes(text: str) -> str:
     """Replace multiple consecutive dashes with a single dash."""
-    return re.sub(r'-+', '-', text)
+    return _DASH_RE.sub('-', text)
 
 
 def generate_content_file_name(text: str) -> str:
     # Keep only letters and spaces
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    text = _NONALPHA_RE.sub('', text)
     # Lowercase
     text = text.lower()
     # Collapse multiple spaces into one
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WS_RE.sub(' ', text).strip()
     # Replace spaces with '-'
     return text.replace(' ', '-')
 
 
 def get_content_key(filename: str):
-    try:
-        filename = filename.split(".md")[0].split("@")[1]
-    except:
-        filename = filename
-    return filename
+    """Node id from a content file name ("title@<id>.md" -> "<id>"); names without "@" are returned as-is."""
+    stem = filename.partition(".md")[0]
+    _, sep, key = stem.partition("@")
+    if not sep:
+        return filename
+    return key.partition("@")[0]
 
 
 def extract_content(skill_dir: str):
     CONTENT_DIR = Path(skill_dir) / "content"
     response = {}
-     # resource intro variants
-    markers = [
-        "Visit the following resources",
-        "To learn more, visit the following links",
-        "Learn more from the following resources"
-    ]
-    for filename in os.listdir(CONTENT_DIR):
-        if filename.endswith(".md"):
-            filepath = os.path.join(CONTENT_DIR, filename)
-            with open(filepath, "r", encoding="utf-8") as f:
-                text = f.read()
+    with os.scandir(CONTENT_DIR) as entries:
+        for entry in entries:
+            if not (entry.name.endswith(".md") and entry.is_file(follow_symlinks=False)):
+                continue
+            filename = entry.name
+            with open(entry.path, "rb") as f:
+                try:
+                    text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # Empty files can't be mapped
+                    text = b""
 
             # --- Extract description (everything before "Visit the following resources") ---
             # --- Find earliest marker and split ---
-            split_point = len(text)
-            for marker in markers:
-                idx = text.find(marker)
-                if idx != -1 and idx < split_point:
-                    split_point = idx
-            description = text[:split_point].strip()
-
-            # --- Extract resource links ---
+            marker = _MARKER_RE.search(text)
+            split_point = marker.start() if marker else len(text)
+            description = text[:split_point].decode("utf-8").strip()
+
+            # --- Extract resource links (only after the marker) ---
             urls = []
-            resources_text = text[split_point:]
-            resource_pattern = r'- \[@(\w+)@([^\]]+)\]\(([^)]+)\)'
-            matches = re.findall(resource_pattern, text)
-            
-            for match in matches:
-                resource_type, title, url = match
-                # Map resource types to our schema
-                type_mapping = {
-                    'official': 'course',
-                    'article': 'article', 
-                    'opensource': 'tutorial',
-                    'video': 'video',
-                    'guide': 'guide',
-                    'course': 'course'
-                }
-                
+            for match in _RESOURCE_RE.finditer(text, split_point):
+                resource_type, title, url = match.groups()
                 urls.append({
-                    "type": type_mapping.get(resource_type, 'article'),
-                    "title": title,
-                    "url": url
+                    "type": _TYPE_MAPPING.get(resource_type, 'article'),
+                    "title": title.decode("utf-8"),
+                    "url": url.decode("utf-8")
                 })
+            if isinstance(text, mmap.mmap):
+                text.close()
             response[get_content_key(filename)] = {
                 "description": description,
                 "resources": urls
@@ -83,55 +93,62 @@ def extract_content(skill_dir: str):
     return response
 
 
-def create_nodes_and_edges(roadmap: dict):
-    roadmap_keys = list(roadmap.keys())
-    response = {'nodes': [], 'edges': []}
-    for i in range(len(roadmap_keys)):
-        main_topic = roadmap[roadmap_keys[i]]
-        # print(main_topic)
-        response["nodes"].append({
-            "id": main_topic["id"],
-            "name": main_topic["name"],
-            "resources": main_topic["resources"]
-        })
+def create_node_and_edge_columns(roadmap: dict):
+    """Columnar nodes/edges (parallel lists per field) for a grouped roadmap."""
+    nodes = {"id": [], "name": [], "resources": []}
+    edges = {"source": [], "target": []}
+    node_id, node_name, node_resources = nodes["id"].append, nodes["name"].append, nodes["resources"].append
+    edge_src, edge_dst = edges["source"].append, edges["target"].append
+
+    main_topics = list(roadmap.values())
+    for i, main_topic in enumerate(main_topics):
+        node_id(main_topic["id"])
+        node_name(main_topic["name"])
+        node_resources(main_topic["resources"])
         # Add edges to next main topic (if exists)
-        if i < len(roadmap_keys) - 1:
-            next_topic = roadmap[roadmap_keys[i + 1]]
-            response["edges"].append({
-                "source": main_topic["id"],
-                "target": next_topic["id"]
-            })
+        if i < len(main_topics) - 1:
+            edge_src(main_topic["id"])
+            edge_dst(main_topics[i + 1]["id"])
         for subtopic in main_topic["subtopics"]:
-            # print(subtopic)
-            response["nodes"].append({
-                "id": subtopic["id"],
-                "name": subtopic["name"],
-                "resources": subtopic["resources"]
-            })
-            response["edges"].append({
-                "source": main_topic["id"],
-                "target": subtopic["id"]
-            })
-    return response
+            node_id(subtopic["id"])
+            node_name(subtopic["name"])
+            node_resources(subtopic["resources"])
+            edge_src(main_topic["id"])
+            edge_dst(subtopic["id"])
+    return {"nodes": nodes, "edges": edges}
+
+
+def create_nodes_and_edges(roadmap: dict):
+    """Row-form nodes/edges, as written to data/<skill>_roadmap.json."""
+    columns = create_node_and_edge_columns(roadmap)
+    nodes, edges = columns["nodes"], columns["edges"]
+    return {
+        "nodes": [
+            {"id": node_id, "name": name, "resources": resources}
+            for node_id, name, resources in zip(nodes["id"], nodes["name"], nodes["resources"])
+        ],
+        "edges": [
+            {"source": source, "target": target}
+            for source, target in zip(edges["source"], edges["target"])
+        ]
+    }
 
 
 def generate_mapping_based_roadmap(mapping: dict, content: dict):
     roadmap = {}
-    for mapping_key in mapping.keys():
+    for mapping_key, node_id in mapping.items():
         topics = mapping_key.split(":")
         main_topic = topics[0]
-        if main_topic not in roadmap:
-            resources = content.get(mapping[mapping_key], {})
-            roadmap[main_topic] = {
-                "id": mapping[mapping_key],
-                "name": main_topic,
-                "resources": resources,
-                "subtopics": []
-            }
+        resources = content.get(node_id, {})
+        entry = roadmap.setdefault(main_topic, {
+            "id": node_id,
+            "name": main_topic,
+            "resources": resources,
+            "subtopics": []
+        })
         if len(topics) > 1:
-            resources = content.get(mapping[mapping_key], {})
-            roadmap[main_topic]["subtopics"].append({
-                "id": mapping[mapping_key],
+            entry["subtopics"].append({
+                "id": node_id,
                 "name": topics[1],
                 "resources": resources
             })
@@ -139,24 +156,32 @@ def generate_mapping_based_roadmap(mapping: dict, content: dict):
     return final_roadmap
 
 
-def generate_json_based_roadmap(data: dict, content: dict):
-    roadmap = {'nodes': [], 'edges': []}
+def iter_json_based_nodes(data: dict, content: dict):
+    """Yield roadmap nodes for topic/subtopic entries of a roadmap.sh JSON document."""
     for node in data["nodes"]:
         if node["type"] in ["topic", "subtopic"]: # "paragraph"
-            node_name = node["data"]["label"]
-            resources = content.get(node["id"], {})
-            roadmap["nodes"].append({
+            yield {
                 "id": node["id"],
-                "name": node_name,
-                "resources": resources
-            })
+                "name": node["data"]["label"],
+                "resources": content.get(node["id"], {})
+            }
+
+
+def iter_json_based_edges(data: dict):
+    """Yield roadmap edges of a roadmap.sh JSON document."""
     for edge in data["edges"]:
-        # print(edge)
-        roadmap["edges"].append({
+        yield {
             "source": edge.get("source", ""),
             "target": edge.get("target", "")
-        })
-    return roadmap
+        }
+
+
+def generate_json_based_roadmap(data: dict, content: dict):
+    """Lazy {"nodes", "edges"} sections; write_roadmap_json consumes them without building the lists."""
+    return {
+        "nodes": iter_json_based_nodes(data, content),
+        "edges": iter_json_based_edges(data)
+    }
 
 
 def create_roadmap(skill_location: str, content: dict):
@@ -170,14 +195,35 @@ def create_roadmap(skill_location: str, content: dict):
     #         return generate_mapping_based_roadmap(data, content), True
     
     main_json_file = skill_dir / f"{skill_name}.json"
-    if main_json_file.exists():
-        with open(main_json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if "nodes" in data and "edges" in data:
-                return generate_json_based_roadmap(data, content), True
+    try:
+        data = orjson.loads(main_json_file.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        # No main roadmap file, or one we can't parse: skip this skill rather than abort the batch
+        return {}, False
+    if isinstance(data, dict) and "nodes" in data and "edges" in data:
+        return generate_json_based_roadmap(data, content), True
     return {}, False
 
 
+def write_roadmap_json(path: str, roadmap: dict) -> dict:
+    """Write {"nodes": [...], "edges": [...]} as each section's items are produced; returns item counts per key."""
+    counts = {}
+    with open(path, "wb", buffering=1 << 16) as f:
+        f.write(b"{")
+        for key_idx, (key, items) in enumerate(roadmap.items()):
+            f.write(b",\n  " if key_idx else b"\n  ")
+            f.write(orjson.dumps(key) + b": [")
+            count = 0
+            for item in items:
+                f.write(b",\n    " if count else b"\n    ")
+                f.write(orjson.dumps(item))
+                count += 1
+            f.write(b"\n  ]")
+            counts[key] = count
+        f.write(b"\n}\n")
+    return counts
+
+
 def get_roadmap_and_content(skill_location: str):
     skill_name = skill_location.split("/")[-1]
     content = extract_content(skill_location)
@@ -185,14 +231,31 @@ def get_roadmap_and_content(skill_location: str):
     # with open("data/" + skill_name + "_parsed_content.json", "w", encoding="utf-8") as f:
     #     json.dump(content, f, indent=2, ensure_ascii=False)
     roadmap = create_roadmap(skill_location, content)
-    with open("data/" + skill_name + "_roadmap.json", "w", encoding="utf-8") as f:
-        json.dump(roadmap[0], f, indent=2, ensure_ascii=False)
+    counts = write_roadmap_json("data/" + skill_name + "_roadmap.json", roadmap[0])
+    return skill_name, counts.get("nodes", 0), counts.get("edges", 0)
     
 
-base_path = "raw_data"
+def main(base_path: str = "raw_data"):
+    """Build data/<skill>_roadmap.json for every roadmap folder under base_path."""
+    folder_paths = []
+    with os.scandir(base_path) as entries:
+        for entry in entries:
+            # DirEntry.is_dir() uses the type from the directory read, no extra stat
+            if entry.is_dir():
+                print(entry.name)
+                folder_paths.append(base_path + "/" + entry.name)
+
+    # Folders are independent; parse them on all cores and report each as it finishes
+    total_nodes = total_edges = 0
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(get_roadmap_and_content, folder_path) for folder_path in folder_paths]
+        for future in as_completed(futures):
+            skill_name, node_count, edge_count = future.result()
+            print(f"{skill_name}: {node_count} nodes, {edge_count} edges")
+            total_nodes += node_count
+            total_edges += edge_count
+    print(f"Processed {len(folder_paths)} roadmaps: {total_nodes} nodes, {total_edges} edges")
+
 
-for folder_name in os.listdir(base_path):
-    folder_path = os.path.join(base_path, folder_name)
-    if os.path.isdir(folder_path):
-        print(folder_name)
-        get_roadmap_and_content(base_path + "/" + folder_name)
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,178 @@
-from deps import kuzu_manager
-from fastapi import Request
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+import deps
+from fastapi import Request, HTTPException
+from helper.cache import TTLCache
+from config import app_config
+
+logger = logging.getLogger(__name__)
+
+_cached_kuzu_manager = None
+
 
 def get_kuzu_manager():
     """Return shared Kuzu manager instance."""
-    # Prefer the shared instance set during startup
-    if kuzu_manager is not None:
-        return kuzu_manager
-    # Fallback to the app state if deps hasn't been populated yet
+    global _cached_kuzu_manager
+    if _cached_kuzu_manager is not None:
+        return _cached_kuzu_manager
+    # Prefer the shared instance set during startup (read from the module; it's assigned after import)
+    manager = deps.kuzu_manager
+    if manager is None:
+        # Fallback to the app state if deps hasn't been populated yet
+        try:
+            from app import app as fastapi_app
+            manager = getattr(fastapi_app.state, "kuzu_manager", None)
+        except Exception:
+            manager = None
+    if manager is None:
+        raise RuntimeError("Kuzu manager not initialized")
+    _cached_kuzu_manager = manager
+    return manager
+
+
+# (graph_version, start, end) -> path; concurrent lookups for the same key share one Kuzu query
+_PATH_CACHE = TTLCache(maxsize=1024, ttl=3600)
+_PATH_INFLIGHT: dict = {}
+
+
+async def cached_find_path(manager, start: str, end: str) -> list:
+    """find_learning_path off the event loop, cached per graph version and de-duplicated while in flight."""
+    key = (manager.graph_version, start, end)
+    path = _PATH_CACHE.get(key)
+    if path is not None:
+        return list(path)
+
+    task = _PATH_INFLIGHT.get(key)
+    if task is None:
+        # The lookup runs as its own task so a cancelled caller doesn't cancel it for everyone else
+        task = asyncio.ensure_future(asyncio.to_thread(manager.find_learning_path, start, end))
+        _PATH_INFLIGHT[key] = task
+        task.add_done_callback(lambda t: _finish_path_lookup(key, t))
+    return list(await asyncio.shield(task))
+
+
+def _finish_path_lookup(key, task: asyncio.Future):
+    """Done-callback for cached_find_path: cache the result and clear the in-flight entry."""
+    _PATH_INFLIGHT.pop(key, None)
+    if task.cancelled():
+        return
+    # Retrieve the exception even if every waiter was cancelled, so it isn't reported as unhandled
+    if task.exception() is None:
+        _PATH_CACHE.set(key, task.result())
+
+
+# Authentication helper functions
+
+# blake2b(token) -> (user_record, expires_at); dicts keep insertion order so the first key is the least recently used
+_AUTH_CACHE: dict = {}
+_AUTH_CACHE_LOCK = asyncio.Lock()
+_AUTH_CACHE_MAX_ENTRIES = 10_000
+# Stop serving a cached user this many seconds before the token expires
+_AUTH_EXPIRY_MARGIN = 30
+# Re-validate at least this often so revoked users/tokens drop out quickly
+_AUTH_CACHE_TTL = 60
+
+
+def _auth_cache_key(token: str) -> bytes:
+    """Fixed-size cache key so raw tokens aren't kept in memory."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _decode_token_claims(token: str) -> dict:
+    """Return the (unverified) JWT payload claims, or {} if the token can't be decoded."""
     try:
-        from app import app as fastapi_app
-        if hasattr(fastapi_app.state, "kuzu_manager") and fastapi_app.state.kuzu_manager is not None:
-            return fastapi_app.state.kuzu_manager
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return claims if isinstance(claims, dict) else {}
     except Exception:
-        pass
-    raise RuntimeError("Kuzu manager not initialized")
+        return {}
 
 
-# Authentication helper functions
-def get_current_user(request: Request):
-    """Get current user from session using PocketBase auth validation"""
+def _do_auth_refresh(token: str):
+    """Blocking authRefresh on a per-request client (never the shared one, whose auth store would race)."""
+    from helper.pocketbase_helper import get_pb_client
+    client = get_pb_client()
+    client.auth_store.save(token, None)
+    return client.collection('users').authRefresh()
+
+
+def _do_get_user(token: str, user_id: str):
+    """Blocking users.get_one authenticated as the token owner."""
+    from helper.pocketbase_helper import get_pb_client
+    client = get_pb_client()
+    client.auth_store.save(token, None)
+    return client.collection('users').get_one(user_id)
+
+
+async def get_current_user(request: Request):
+    """Get current user from session, validating the token with PocketBase once per token lifetime"""
     # Get token from cookies
     token = request.cookies.get("auth_token")
     
     if not token:
         return None
-    
+
+    claims = _decode_token_claims(token)
+    exp = claims.get("exp")
+    now = time.time()
+    if exp is not None and now >= exp - _AUTH_EXPIRY_MARGIN:
+        return None
+
+    key = _auth_cache_key(token)
+    async with _AUTH_CACHE_LOCK:
+        cached = _AUTH_CACHE.pop(key, None)
+        if cached is not None and now < cached[1]:
+            # Re-insert so active sessions stay at the young end and eviction drops the least recently used
+            _AUTH_CACHE[key] = cached
+            return cached[0]
+
+    user = await _validate_token(token, claims.get("id"))
+    if user is not None and exp is not None:
+        async with _AUTH_CACHE_LOCK:
+            _AUTH_CACHE.pop(key, None)
+            while len(_AUTH_CACHE) >= _AUTH_CACHE_MAX_ENTRIES:
+                del _AUTH_CACHE[next(iter(_AUTH_CACHE))]
+            _AUTH_CACHE[key] = (user, min(exp - _AUTH_EXPIRY_MARGIN, now + _AUTH_CACHE_TTL))
+    return user
+
+
+async def invalidate_cached_user(token: str):
+    """Drop a token's cached user (e.g. on logout)."""
+    async with _AUTH_CACHE_LOCK:
+        _AUTH_CACHE.pop(_auth_cache_key(token), None)
+
+
+async def _validate_token(token: str, user_id: str | None):
+    """Validate a token against PocketBase off the event loop and return the user record or None"""
+    # Try to refresh the token to validate it
     try:
-        # Create a new PocketBase client instance to avoid corrupting the shared one
-        from helper.pocketbase_helper import get_pb_client
-        client = get_pb_client()
-        
-        # Set the token in the new client's auth store
-        client.auth_store.save(token, {"id": "temp", "email": "temp"})
-        
-        # Try to refresh the token to validate it
+        auth_data = await asyncio.to_thread(_do_auth_refresh, token)
+        if auth_data and auth_data.record:
+            return auth_data.record
+    except Exception as refresh_error:
+        logger.debug("Token refresh failed: %s", refresh_error)
+        # If refresh fails, try to get user info directly
+        if not user_id:
+            return None
         try:
-            auth_data = client.collection('users').authRefresh()
-            if auth_data and auth_data.record:
-                return auth_data.record
-        except Exception as refresh_error:
-            print(f"Token refresh failed: {refresh_error}")
-            # If refresh fails, try to get user info directly
-            try:
-                # Try to get current user info without refresh
-                user_info = client.collection('users').get_one(client.auth_store.model.id)
-                if user_info:
-                    return user_info
-            except Exception as get_error:
-                print(f"Get user info failed: {get_error}")
-                return None
-        
-        return None
-            
-    except Exception as e:
-        print(f"Auth validation error: {e}")
-        return None
+            user_info = await asyncio.to_thread(_do_get_user, token, user_id)
+            if user_info:
+                return user_info
+        except Exception as get_error:
+            logger.warning("Get user info failed: %s", get_error)
+            return None
+
+    return None
+
+
+async def require_authenticated_user(request: Request):
+    """Dependency for HTML pages: return the current user or redirect to the login page"""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=302, headers={"Location": f"{app_config.url_prefix}/login"})
+    return user
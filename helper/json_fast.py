@@ -0,0 +1,20 @@
+import mmap
+import os
+from typing import Any
+
+import orjson
+
+
+def loads_path(path) -> Any:
+    """Parse a JSON file with orjson straight from a read-only mmap of its bytes."""
+    with open(path, "rb") as f:
+        # Empty files can't be mapped; let orjson raise its usual decode error
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return orjson.loads(view)
+            finally:
+                # The mmap can't close while a view is still exported
+                view.release()
@@ -1,11 +1,15 @@
 from operator import le
+import logging
 import kuzu
-import json
 import os
 import uuid
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+from helper.json_fast import loads_path
+
+logger = logging.getLogger(__name__)
+
 class KuzuSkillGraph:
     """
     KuzuDB integration for storing and managing learning roadmap skills as a graph database.
@@ -15,8 +19,28 @@ class KuzuSkillGraph:
         """Initialize KuzuDB connection and create schema."""
         self.db = kuzu.Database(db_path)
         self.conn = kuzu.Connection(self.db)
+        # Bumped on every write so read caches can tell when the graph changed
+        self.graph_version = 0
+        self._all_skills_cache: Optional[List[Dict]] = None
+        # Read queries from hot endpoints, prepared once and reused (skips parse/plan per call)
+        self._prepared: Dict[str, Any] = {}
         # self._create_schema()
     
+    def _execute_prepared(self, query: str, parameters: Optional[Dict[str, Any]] = None):
+        """Execute a read query through a lazily prepared (cached) statement."""
+        statement = self._prepared.get(query)
+        if statement is None:
+            statement = self.conn.prepare(query)
+            if not statement.is_success():
+                raise RuntimeError(statement.get_error_message())
+            self._prepared[query] = statement
+        return self.conn.execute(statement, parameters or {})
+    
+    def _bump_graph_version(self):
+        """Invalidate cached reads after the graph has been mutated."""
+        self.graph_version += 1
+        self._all_skills_cache = None
+    
     def _create_schema(self):
         """Create comprehensive graph schema for skills, nodes, and resources."""
         # Create Skill node table
@@ -103,12 +127,12 @@ class KuzuSkillGraph:
             print(f"Warning: Roadmap file not found for skill: {skill_name} at {file_path}")
             return skill_id_mapping
         # try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            skill_data = json.load(f)
+        skill_data = loads_path(file_path)
         
         # Insert skill node
         skill_id = str(uuid.uuid4())
         skill_id_mapping[skill_name] = skill_id
+        self._bump_graph_version()
         self.conn.execute("""
             MERGE (s:Skill {id: $skill_id, name: $name, order_index: $order_index})
         """, parameters={
@@ -315,9 +339,21 @@ class KuzuSkillGraph:
             "from_id": from_skill,
             "to_id": to_skill
         })
+        self._bump_graph_version()
         
         print(f"Added skill connection: {from_skill} -> {to_skill}")
     
+    def bulk_add_connections(self, pairs: List[Dict[str, str]]):
+        """Add many skill connections ({"from_id", "to_id"} dicts) with a single UNWIND query."""
+        if not pairs:
+            return
+        self.conn.execute("""
+            UNWIND $pairs AS pair
+            MATCH (from:Skill {id: pair.from_id}), (to:Skill {id: pair.to_id})
+            MERGE (from)-[:SKILL_CONNECTION]->(to)
+        """, parameters={"pairs": pairs})
+        self._bump_graph_version()
+    
     def add_skill_connections_from_progression(self, skill_id_mapping: Dict[str, str]):
         """Add skill connections based on logical learning progression from the skills list."""
         # Define the logical learning progression connections
@@ -465,20 +501,22 @@ class KuzuSkillGraph:
             ("ai data scientist", "ai agents"),
         ]
         
-        # Add all connections
+        # Resolve names to ids, then add all connections in one statement
+        pairs = []
         for from_skill, to_skill in connections:
-            try:
-                self.add_skill_connection(skill_id_mapping[from_skill], skill_id_mapping[to_skill])
-            except Exception as e:
-                print(f"Warning: Could not add connection {from_skill} -> {to_skill}: {str(e)}")
+            if from_skill not in skill_id_mapping or to_skill not in skill_id_mapping:
+                print(f"Warning: Could not add connection {from_skill} -> {to_skill}: unknown skill")
+                continue
+            pairs.append({"from_id": skill_id_mapping[from_skill], "to_id": skill_id_mapping[to_skill]})
+        self.bulk_add_connections(pairs)
         
-        print(f"Added {len(connections)} skill connections based on learning progression")
+        print(f"Added {len(pairs)} skill connections based on learning progression")
     
     def get_skill_info(self, skill_name: str) -> Dict[str, Any]:
         """Retrieve information for a specific skill."""
         
         # Get skill information
-        result = self.conn.execute("""
+        result = self._execute_prepared("""
             MATCH (s:Skill {name: $skill_name})
             RETURN s.id as id, s.order_index as order_index
         """, parameters={"skill_name": skill_name})
@@ -595,7 +633,10 @@ class KuzuSkillGraph:
         }
     
     def get_all_skills(self) -> List[Dict]:
-        """Get all skills from the database."""
+        """Get all skills from the database (cached until the graph changes)."""
+        if self._all_skills_cache is not None:
+            return list(self._all_skills_cache)
+        
         result = self.conn.execute("""
             MATCH (s:Skill)
             RETURN s.id as id, s.name as name, s.order_index as order_index
@@ -611,7 +652,8 @@ class KuzuSkillGraph:
                 "order_index": row[2]
             })
         
-        return skills
+        self._all_skills_cache = skills
+        return list(skills)
     
     def get_all_skill_connections(self) -> List[Dict]:
         """Get all skill connections from the database."""
@@ -634,7 +676,7 @@ class KuzuSkillGraph:
     
     def get_skill_by_id(self, skill_id: str) -> Optional[Dict[str, Any]]:
         """Get a single skill by its id."""
-        result = self.conn.execute("""
+        result = self._execute_prepared("""
             MATCH (s:Skill {id: $id})
             RETURN s.id as id, s.name as name, s.order_index as order_index
             LIMIT 1
@@ -651,7 +693,7 @@ class KuzuSkillGraph:
 
     def get_skill_prerequisites(self, skill_id: str) -> List[Dict[str, Any]]:
         """Get prerequisite skills (incoming skill connections)."""
-        result = self.conn.execute("""
+        result = self._execute_prepared("""
             MATCH (pre:Skill)-[:SKILL_CONNECTION]->(s:Skill {id: $id})
             RETURN pre.id as id, pre.name as name
         """, parameters={"id": skill_id})
@@ -681,12 +723,12 @@ class KuzuSkillGraph:
                 })
             return skills
         except Exception as e:
-            print(f"Error getting skill prerequisites by name: {e}")
+            logger.warning("Error getting skill prerequisites by name: %s", e)
             return []
 
     def get_skill_next_skills(self, skill_id: str) -> List[Dict[str, Any]]:
         """Get next skills (outgoing skill connections)."""
-        result = self.conn.execute("""
+        result = self._execute_prepared("""
             MATCH (s:Skill {id: $id})-[:SKILL_CONNECTION]->(next:Skill)
             RETURN next.id as id, next.name as name
         """, parameters={"id": skill_id})
@@ -699,6 +741,49 @@ class KuzuSkillGraph:
             })
         return skills
 
+    def get_skill_with_neighbors(self, skill_id: str) -> Optional[Dict[str, Any]]:
+        """Get a skill with its prerequisites and next skills in a single query."""
+        result = self._execute_prepared("""
+            MATCH (s:Skill {id: $id})
+            OPTIONAL MATCH (pre:Skill)-[:SKILL_CONNECTION]->(s)
+            WITH s, collect([pre.id, pre.name]) AS prerequisites
+            OPTIONAL MATCH (s)-[:SKILL_CONNECTION]->(next:Skill)
+            RETURN s.id, s.name, s.order_index, prerequisites, collect([next.id, next.name]) AS next_skills
+        """, parameters={"id": skill_id})
+        if not result.has_next():
+            return None
+        row = result.get_next()
+        # OPTIONAL MATCH yields a single [null, null] pair when there are no neighbours
+        return {
+            "id": row[0],
+            "name": row[1],
+            "description": f"Learn {row[1]} skills and concepts",
+            "order_index": row[2],
+            "prerequisites": [{"id": pid, "name": pname} for pid, pname in row[3] if pid is not None],
+            "next_skills": [{"id": nid, "name": nname} for nid, nname in row[4] if nid is not None]
+        }
+
+    def get_skill_summary(self, skill_id: str) -> Optional[Dict[str, Any]]:
+        """Get a skill with prerequisite/next-skill counts (no neighbour rows) in a single query."""
+        result = self._execute_prepared("""
+            MATCH (s:Skill {id: $id})
+            OPTIONAL MATCH (pre:Skill)-[:SKILL_CONNECTION]->(s)
+            WITH s, count(pre) AS total_prerequisites
+            OPTIONAL MATCH (s)-[:SKILL_CONNECTION]->(next:Skill)
+            RETURN s.id, s.name, s.order_index, total_prerequisites, count(next) AS total_next_skills
+        """, parameters={"id": skill_id})
+        if not result.has_next():
+            return None
+        row = result.get_next()
+        return {
+            "id": row[0],
+            "name": row[1],
+            "description": f"Learn {row[1]} skills and concepts",
+            "order_index": row[2],
+            "total_prerequisites": row[3],
+            "total_next_skills": row[4]
+        }
+
     def get_roadmap_progression(self) -> Dict[str, Any]:
         """Get skills from KuzuDB in their stored order for roadmap visualization."""
         # Get all skills from database in their stored order
@@ -729,7 +814,7 @@ class KuzuSkillGraph:
 
     def find_learning_path(self, start_skill: str, end_skill: str) -> List[Dict[str, str]]:
         """Find a learning path between two skills using KuzuDB shortest path."""
-        res = self.conn.execute(
+        res = self._execute_prepared(
             """
             MATCH path = (s1:Skill {name: $start_skill})-[:SKILL_CONNECTION*1..10]-(s2:Skill {name: $end_skill})
             RETURN path
@@ -743,9 +828,7 @@ class KuzuSkillGraph:
             row = res.get_next()
             for node in row[0]["_nodes"]:
                 path.append({"id": node["id"], "name": node["name"]})
-        print("=================================")
-        print("Path objects:", path)
-        print("=================================")
+        logger.debug("Path objects: %s", path)
         return path
     
     def search_skills(self, query: str, category: str = None, difficulty: str = None) -> List[Dict]:
@@ -771,12 +854,14 @@ class KuzuSkillGraph:
     def execute_cypher_query(self, query: str, parameters: Dict = None) -> List[Dict]:
         """Execute a Cypher query and return the results."""
         result = self.conn.execute(query, parameters=parameters)
+        # Arbitrary queries may write, so don't trust cached reads afterwards
+        self._bump_graph_version()
         return result
     
     def get_learning_nodes_by_skill_name(self, skill_name: str) -> List[Dict[str, Any]]:
         """Get learning nodes for a specific skill by name."""
         try:
-            result = self.conn.execute(f"""
+            result = self._execute_prepared(f"""
                 MATCH (s:Skill)<-[:BELONGS_TO]-(l:LearningNode)
                 WHERE s.name = $skill_name
                 OPTIONAL MATCH path = (start:LearningNode)-[:PREREQUISITE*0..]->(l)
@@ -797,14 +882,14 @@ class KuzuSkillGraph:
                 })
             return learning_nodes
         except Exception as e:
-            print(f"Error getting learning nodes by skill name: {e}")
+            logger.warning("Error getting learning nodes by skill name: %s", e)
             return []
 
     def get_resources_by_learning_node_id(self, learning_node_id: str) -> List[Dict[str, Any]]:
         """Get resources for a specific learning node."""
         try:
-            print(f"Getting resources for learning node id: {learning_node_id}")
-            result = self.conn.execute("""
+            logger.debug("Getting resources for learning node id: %s", learning_node_id)
+            result = self._execute_prepared("""
                 MATCH (l:LearningNode {id: $learning_node_id})-[:HAS_RESOURCE]->(r:Resource)
                 RETURN r.id, r.title, r.url, r.type
                 ORDER BY r.title;
@@ -820,13 +905,13 @@ class KuzuSkillGraph:
                 })
             return resources
         except Exception as e:
-            print(f"Error getting resources by learning node id: {e}")
+            logger.warning("Error getting resources by learning node id: %s", e)
             return []
     
     def get_skill_edges(self, skill_name: str) -> List[Dict[str, Any]]:
         """Get skill edges for a specific skill."""
         try:
-            result = self.conn.execute(f"""
+            result = self._execute_prepared(f"""
                 MATCH (s:Skill {{name: $skill_name}})<-[:BELONGS_TO]-(from:LearningNode)
                 MATCH (from)-[:PREREQUISITE]->(to:LearningNode)-[:BELONGS_TO]->(s)
                 RETURN from.id as source, to.id as target;
@@ -840,7 +925,7 @@ class KuzuSkillGraph:
                 })
             return edges
         except Exception as e:
-            print(f"Error getting skill edges: {e}")
+            logger.warning("Error getting skill edges: %s", e)
             return []
     
     def close(self):
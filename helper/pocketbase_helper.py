@@ -1,23 +1,80 @@
+import re
+import threading
+import time
+from typing import Any, Dict
+
 from config import app_config
 from pocketbase import PocketBase
 import httpx
 
+# Re-authenticate the shared admin client this often (kept well under PocketBase's admin token lifetime)
+ADMIN_TOKEN_TTL = 3600
+_ADMIN_REFRESH_MARGIN = 60
 
-def get_pb_admin_client():
-    """Get a PocketBase admin client instance."""
-    print("POCKETBASE URL:")
-    print(app_config.pocketbase_url)
-    print("POCKETBASE EMAIL:")
-    print(app_config.pocketbase_email)
-    print("POCKETBASE PASSWORD:")
-    print(app_config.pocketbase_password)
-    client = PocketBase(app_config.pocketbase_url, http_client=httpx.Client(verify=False))
+# One connection pool for every PocketBase SDK client (httpx.Client is thread-safe)
+_http_client = httpx.Client(verify=False, limits=httpx.Limits(max_keepalive_connections=32))
+
+_admin_client = None
+_admin_token_issued_at = 0.0
+_admin_lock = threading.Lock()
+
+
+def _create_admin_client() -> PocketBase:
+    """Create and authenticate a new PocketBase admin client."""
+    client = PocketBase(app_config.pocketbase_url, http_client=_http_client)
     admin_data = client.admins.auth_with_password(app_config.pocketbase_email, app_config.pocketbase_password)
     if not admin_data.is_valid:
         raise Exception("Invalid PB credentials")
     return client
 
+
+def get_pb_admin_client():
+    """Get the shared PocketBase admin client, re-authenticating when its token is about to expire."""
+    global _admin_client, _admin_token_issued_at
+    if _admin_client is not None and time.monotonic() - _admin_token_issued_at < ADMIN_TOKEN_TTL - _ADMIN_REFRESH_MARGIN:
+        return _admin_client
+    with _admin_lock:
+        # Another thread may have refreshed while we waited for the lock
+        if _admin_client is None or time.monotonic() - _admin_token_issued_at >= ADMIN_TOKEN_TTL - _ADMIN_REFRESH_MARGIN:
+            _admin_client = _create_admin_client()
+            _admin_token_issued_at = time.monotonic()
+    return _admin_client
+
 def get_pb_client() -> PocketBase:
     """Get a PocketBase client instance."""
-    client = PocketBase(app_config.pocketbase_url, http_client=httpx.Client(verify=False))
+    # Clients keep their own auth store; only the connection pool is shared
+    client = PocketBase(app_config.pocketbase_url, http_client=_http_client)
     return client
+
+
+_PLACEHOLDER_RE = re.compile(r"\{:(\w+)\}")
+
+
+def _pb_literal(value: Any) -> str:
+    """PocketBase filter literal for a Python value."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        if value.endswith("\\"):
+            # PocketBase's filter scanner ends a string at the first quote not preceded by a backslash,
+            # so a trailing backslash would escape the closing quote whatever we double it to
+            raise ValueError("Filter values cannot end with a backslash")
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    return str(value)
+
+
+def pb_filter(raw: str, params: Dict[str, Any]) -> str:
+    """Fill {:name} placeholders with quoted, escaped literals; mirrors PocketBase.filter, which the pinned SDK predates.
+
+    Substitution is a single pass, so placeholder-like text inside a value is never expanded.
+    Raises KeyError for a placeholder missing from params and ValueError for an unrepresentable value.
+    """
+    def substitute(match: re.Match) -> str:
+        name = match.group(1)
+        if name not in params:
+            raise KeyError(f"No value for filter placeholder {{:{name}}}")
+        return _pb_literal(params[name])
+
+    return _PLACEHOLDER_RE.sub(substitute, raw)
@@ -0,0 +1,143 @@
+import hashlib
+import time
+from typing import Any, Callable, Dict, Tuple
+
+import orjson
+
+LEVEL_X_SPACING = 400
+LEVEL_Y_SPACING = 150
+# Upper bound on serving a cached payload; catches writes made by other processes (e.g. populate_kuzu_db.py)
+ROADMAP_CACHE_TTL = 300
+
+
+def build_roadmap_progression(manager) -> Dict[str, Any]:
+    """Build the Cytoscape.js roadmap progression payload from the skills graph."""
+    progression = manager.get_roadmap_progression()
+
+    # Get level names from the levels dictionary
+    levels = progression["levels"]
+    level_names = list(levels.keys())
+
+    # Per-level x coordinate and CSS classes, computed once per level rather than per skill
+    level_xs = [level_idx * LEVEL_X_SPACING + 200 for level_idx in range(len(level_names))]
+    classes_cache = [f"level-{level_idx} {level_name.replace('_', '-')}" for level_idx, level_name in enumerate(level_names)]
+
+    # Convert to Cytoscape.js format with level-based positioning
+    nodes = [
+        {
+            "data": {
+                "id": skill["id"],
+                "name": skill["name"],
+                "description": skill.get("description", ""),
+                "level": level_name,
+                "level_index": level_idx,
+                "skill_index": skill_idx
+            },
+            "position": {
+                "x": level_xs[level_idx],
+                "y": skill_idx * LEVEL_Y_SPACING + 200
+            },
+            "classes": classes_cache[level_idx]
+        }
+        for level_idx, level_name in enumerate(level_names)
+        for skill_idx, skill in enumerate(levels.get(level_name, []))
+    ]
+
+    # Add only the real skill connections whose endpoints are both in our nodes
+    node_ids = frozenset(node["data"]["id"] for node in nodes)
+    edges = [
+        {
+            "data": {
+                "id": f"{connection['from_skill']}-{connection['to_skill']}",
+                "source": connection["from_skill"],
+                "target": connection["to_skill"],
+                "relationship_type": connection.get("relationship_type", "prerequisite"),
+                "weight": connection.get("weight", 1)
+            },
+            "classes": "progression-edge"
+        }
+        for connection in progression["connections"]
+        if connection["from_skill"] in node_ids and connection["to_skill"] in node_ids
+    ]
+
+    return {
+        "format_version": "1.0",
+        "generated_by": "learning-map-app",
+        "elements": {
+            "nodes": nodes,
+            "edges": edges
+        },
+        "levels": progression["levels"],
+        "level_names": level_names,
+        "total_skills": progression["total_skills"]
+    }
+
+
+def build_roadmap_flat(manager) -> Dict[str, Any]:
+    """Build a flat Cytoscape.js skills graph (no levels or positions)."""
+    skills = manager.get_all_skills()
+    connections = manager.get_all_skill_connections()
+
+    # Build nodes without level grouping or explicit positions
+    nodes = [
+        {
+            "data": {
+                "id": skill["id"],
+                "name": skill["name"],
+                "description": skill.get("description", ""),
+                "order_index": skill.get("order_index", 0)
+            }
+        }
+        for skill in skills
+    ]
+
+    # Build edges directly from skill connections
+    edges = [
+        {
+            "data": {
+                "id": f"{connection['from_skill']}-{connection['to_skill']}",
+                "source": connection["from_skill"],
+                "target": connection["to_skill"],
+                "relationship_type": connection.get("relationship_type", "prerequisite"),
+                "weight": connection.get("weight", 1)
+            }
+        }
+        for connection in connections
+    ]
+
+    return {
+        "format_version": "1.0",
+        "generated_by": "learning-map-app",
+        "elements": {
+            "nodes": nodes,
+            "edges": edges
+        },
+        "total_skills": len(skills),
+        "total_edges": len(edges)
+    }
+
+
+def _get_cached_body(state, attr: str, manager, build: Callable[[Any], Dict[str, Any]]) -> Tuple[bytes, str]:
+    """Return (json_body, etag) cached on app state under attr, rebuilt when the graph version changes."""
+    cached = getattr(state, attr, None)
+    if cached is not None and cached[0] == manager.graph_version and time.monotonic() < cached[3]:
+        return cached[1], cached[2]
+    # Read the version before building so a concurrent mutation forces another rebuild
+    version = manager.graph_version
+    payload = build(manager)
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    # Don't pin an empty graph (e.g. requested before the database was populated)
+    if payload["elements"]["nodes"]:
+        setattr(state, attr, (version, body, etag, time.monotonic() + ROADMAP_CACHE_TTL))
+    return body, etag
+
+
+def get_cached_roadmap_progression(state, manager) -> Tuple[bytes, str]:
+    """Serialized progression payload and its ETag."""
+    return _get_cached_body(state, "progression_cache", manager, build_roadmap_progression)
+
+
+def get_cached_roadmap_flat(state, manager) -> Tuple[bytes, str]:
+    """Serialized flat roadmap payload and its ETag."""
+    return _get_cached_body(state, "flat_roadmap_cache", manager, build_roadmap_flat)
@@ -1,10 +1,75 @@
 import hashlib
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
+from pocketbase.utils import ClientResponseError
 from config import app_config
+from helper.pocketbase_helper import get_pb_admin_client, pb_filter
+
+logger = logging.getLogger(__name__)
+
+# PocketBase's default batch.maxRequests
+BATCH_MAX_REQUESTS = 50
+# Custom route registered by pb_hooks/save_roadmap_path.pb.js
+ROADMAP_PATH_HOOK = "/api/atlas/roadmap-paths"
+
+# Record attributes the read methods return; also sent as the `fields` projection
+_USER_PATH_KEYS = ("id", "progress", "completed_at", "roadmap_path_id", "created", "updated")
+_NODE_PROGRESS_KEYS = ("id", "learning_node_id", "skill_id", "user_roadmap_path_id", "completed_at", "created", "updated")
+# Values for attributes missing from a record, parallel to the key tuples (keeps the API's JSON shape)
+_USER_PATH_DEFAULTS = (None, 0, None, None, None, None)
+_NODE_PROGRESS_DEFAULTS = (None, '', '', '', None, None, None)
+_USER_PATH_FIELDS = ",".join(_USER_PATH_KEYS)
+_NODE_PROGRESS_FIELDS = ",".join((
+    *_NODE_PROGRESS_KEYS,
+    "expand.user_roadmap_path_id.progress",
+    "expand.user_roadmap_path_id.roadmap_path_id",
+    "expand.user_roadmap_path_id.expand.roadmap_path_id.name",
+    "expand.user_roadmap_path_id.expand.roadmap_path_id.roadmap_id",
+    "expand.user_roadmap_path_id.expand.roadmap_path_id.expand.roadmap_id.name",
+))
+
+
+@lru_cache(maxsize=8)
+def _secret_state(secret: str):
+    """SHA-256 state with the secret already absorbed; copied for each sequence."""
+    return hashlib.sha256(secret.encode())
+
+
+@lru_cache(maxsize=4096)
+def _hash(secret: str, seq: str) -> str:
+    """Short sha256(secret + seq) hex digest."""
+    h = _secret_state(secret).copy()
+    h.update(seq.encode())
+    return h.hexdigest()[:16]
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO-8601 string with a Z suffix."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _row(record, keys, defaults) -> Dict[str, Any]:
+    """Plain dict of the given record attributes, read straight from the record's __dict__."""
+    data = vars(record)
+    return {key: data.get(key, default) for key, default in zip(keys, defaults)}
+
+
+def _expanded(record, field: str):
+    """Record expanded under field, or None (also when record itself is None)."""
+    expand = getattr(record, 'expand', None) or {}
+    return expand.get(field)
+
+
+_shared_helper = None
 
 
 class UserProgressHelper:
     """Helper class for managing user progress tracking with PocketBase"""
+
+    # Flipped off (per process) the first time the hook route answers 404
+    _roadmap_path_hook_available = True
     
     def __init__(self, pb_instance):
         # Require an explicit PocketBase instance (admin client recommended)
@@ -20,101 +85,149 @@ class UserProgressHelper:
         """Generate a hash for skill sequence using SECRET"""
         if not self.secret:
             raise ValueError("SECRET not configured in environment variables")
-        
-        # Combine secret with skill sequence and hash
-        combined = f"{self.secret}{skill_sequence}"
-        return hashlib.sha256(combined.encode()).hexdigest()[:16]  # Short hash
+        return _hash(self.secret, skill_sequence)
     
     def _create_roadmap_name(self, start_skill: str, target_skill: str) -> str:
         """Create roadmap name in format: start skill-target-skill"""
         return f"{start_skill}-{target_skill}"
     
+    def _first_or_none(self, collection: str, filter: str, fields: str = "id"):
+        """First record matching filter, or None (one request; PocketBase stops at the first match)."""
+        try:
+            # Only the projected fields, and no COUNT(*) for totalItems
+            return self.pb.collection(collection).get_first_list_item(filter, {"fields": fields, "skipTotal": 1})
+        except ClientResponseError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def _create_or_get(self, collection: str, payload: Dict, filter: str):
+        """Create a record, or return (existing, False) when a unique index rejects it."""
+        try:
+            return self.pb.collection(collection).create(payload), True
+        except ClientResponseError as e:
+            if e.status != 400:
+                raise
+            existing = self._first_or_none(collection, filter)
+            if existing is None:
+                # A plain validation error, not a duplicate
+                raise
+            return existing, False
+
+    def _send_batch(self, requests: List[Dict]) -> List[Dict]:
+        """Send write requests through PocketBase's /api/batch endpoint, BATCH_MAX_REQUESTS per transaction."""
+        responses = []
+        for start in range(0, len(requests), BATCH_MAX_REQUESTS):
+            chunk = requests[start:start + BATCH_MAX_REQUESTS]
+            responses.extend(self.pb.send("/api/batch", {"method": "POST", "body": {"requests": chunk}}) or [])
+        return responses
+
     def save_user_roadmap_path(self, user_id: str, start_skill: str, target_skill: str, 
                               skill_path: List[Dict]) -> Dict:
         """Persist user's roadmap path and mappings in PocketBase (admin client)."""
-        roadmap_name = self._create_roadmap_name(start_skill, target_skill)
         skill_sequence = "-".join([skill["name"] for skill in skill_path])
         skill_sequence_hash = self._generate_skill_sequence_hash(skill_sequence)
+        details = {
+            "user_id": user_id,
+            "roadmap_name": self._create_roadmap_name(start_skill, target_skill),
+            "roadmap_description": f"Learning path from {start_skill} to {target_skill}",
+            "path_name": f"Path: {skill_sequence}",
+            "path_description": f"Learning path: {skill_sequence}",
+            "skill_sequence_hash": skill_sequence_hash,
+            "skills": [{
+                "skill_id": skill["id"],
+                "order_index": index,
+                "learning_nodes_count": skill.get("learning_nodes_count", 0)
+            } for index, skill in enumerate(skill_path)]
+        }
 
-        # 1) Roadmap (by name)
-        existing_roadmaps = self.pb.collection('roadmaps').get_list(1, 1, {
-            "filter": f"name = '{roadmap_name}'"
-        })
-        if existing_roadmaps.items:
-            roadmap_id = existing_roadmaps.items[0].id
+        # One request and one transaction when the pb_hooks route is deployed
+        ids = self._save_roadmap_path_hook(details)
+        if ids is None:
+            ids = self._save_roadmap_path_steps(details)
+
+        return {
+            "success": True,
+            "roadmap_id": ids["roadmap_id"],
+            "roadmap_path_id": ids["roadmap_path_id"],
+            "user_roadmap_path_id": ids["user_roadmap_path_id"],
+            "skill_sequence": skill_sequence,
+            "skill_sequence_hash": skill_sequence_hash
+        }
+
+    def _save_roadmap_path_hook(self, details: Dict) -> Optional[Dict]:
+        """Save through pb_hooks/save_roadmap_path.pb.js; None if that route isn't registered."""
+        if not UserProgressHelper._roadmap_path_hook_available:
+            return None
+        try:
+            return self.pb.send(ROADMAP_PATH_HOOK, {"method": "POST", "body": details})
+        except ClientResponseError as e:
+            if e.status != 404:
+                raise
+            logger.info("%s not registered; saving roadmap paths step by step", ROADMAP_PATH_HOOK)
+            UserProgressHelper._roadmap_path_hook_available = False
+            return None
+
+    def _save_roadmap_path_steps(self, details: Dict) -> Dict:
+        """Client-side fallback for the roadmap path hook (several requests, no shared transaction)."""
+        skill_sequence_hash = details["skill_sequence_hash"]
+        roadmap_name = details["roadmap_name"]
+
+        # 1) Roadmap path (by skill_sequence_hash); an existing path already knows its roadmap
+        existing_path = self._first_or_none('roadmap_paths', pb_filter("skill_sequence_hash = {:skill_sequence_hash}", {"skill_sequence_hash": skill_sequence_hash}), "id,roadmap_id")
+        if existing_path is not None:
+            roadmap_path_id = existing_path.id
+            roadmap_id = getattr(existing_path, 'roadmap_id', '')
         else:
-            roadmap = self.pb.collection('roadmaps').create({
+            # 2) Roadmap (by name)
+            roadmap, _ = self._create_or_get('roadmaps', {
                 "name": roadmap_name,
-                "description": f"Learning path from {start_skill} to {target_skill}"
-            })
+                "description": details["roadmap_description"]
+            }, pb_filter("name = {:roadmap_name}", {"roadmap_name": roadmap_name}))
             roadmap_id = roadmap.id
 
-        # 2) Roadmap path (by skill_sequence_hash)
-        existing_paths = self.pb.collection('roadmap_paths').get_list(1, 1, {
-            "filter": f"skill_sequence_hash = '{skill_sequence_hash}'"
-        })
-        if existing_paths.items:
-            roadmap_path_id = existing_paths.items[0].id
-        else:
-            roadmap_path = self.pb.collection('roadmap_paths').create({
-                "name": f"Path: {skill_sequence}",
+            roadmap_path, created = self._create_or_get('roadmap_paths', {
+                "name": details["path_name"],
                 "roadmap_id": roadmap_id,
                 "skill_sequence_hash": skill_sequence_hash,
-                "description": f"Learning path: {skill_sequence}"
-            })
+                "description": details["path_description"]
+            }, pb_filter("skill_sequence_hash = {:skill_sequence_hash}", {"skill_sequence_hash": skill_sequence_hash}))
             roadmap_path_id = roadmap_path.id
 
-            # 3) Path skills
-            for index, skill in enumerate(skill_path):
-                self.pb.collection('roadmap_path_skills').create({
-                    "roadmap_path_id": roadmap_path_id,
-                    "skill_id": skill["id"],
-                    "order_index": index,
-                    "learning_nodes_count": skill.get("learning_nodes_count", 0)
-                })
+        # 3) Path skills, all in one batch request (skipped if a concurrent request created the path)
+        if existing_path is None and created:
+            self._send_batch([{
+                "method": "POST",
+                "url": "/api/collections/roadmap_path_skills/records",
+                "body": {"roadmap_path_id": roadmap_path_id, **skill}
+            } for skill in details["skills"]])
 
         # 4) User mapping
-        existing_user_paths = self.pb.collection('user_roadmap_path').get_list(1, 1, {
-            "filter": f"user_id = '{user_id}' && roadmap_path_id = '{roadmap_path_id}'"
-        })
-        if not existing_user_paths.items:
-            user_roadmap_path = self.pb.collection('user_roadmap_path').create({
-                "user_id": user_id,
-                "roadmap_path_id": roadmap_path_id,
-                "progress": 0.0
-            })
-            user_roadmap_path_id = user_roadmap_path.id
-        else:
-            user_roadmap_path_id = existing_user_paths.items[0].id
+        user_id = details["user_id"]
+        user_roadmap_path, _ = self._create_or_get('user_roadmap_path', {
+            "user_id": user_id,
+            "roadmap_path_id": roadmap_path_id,
+            "progress": 0.0
+        }, pb_filter("user_id = {:user_id} && roadmap_path_id = {:roadmap_path_id}", {"user_id": user_id, "roadmap_path_id": roadmap_path_id}))
 
         return {
-            "success": True,
             "roadmap_id": roadmap_id,
             "roadmap_path_id": roadmap_path_id,
-            "user_roadmap_path_id": user_roadmap_path_id,
-            "skill_sequence": skill_sequence,
-            "skill_sequence_hash": skill_sequence_hash
+            "user_roadmap_path_id": user_roadmap_path.id
         }
     
     def get_user_roadmap_paths(self, user_id: str) -> List[Dict]:
         """Get all roadmap paths for a user (admin client)."""
         try:
-            print(f"Getting user roadmap paths for user_id: {user_id}")
+            logger.debug("Getting user roadmap paths for user_id: %s", user_id)
             user_paths = self.pb.collection('user_roadmap_path').get_list(1, 50, {
-                "filter": f"user_id = '{user_id}'",
-                "expand": "roadmap_path_id,roadmap_path_id.roadmap_id"
+                "filter": pb_filter("user_id = {:user_id}", {"user_id": user_id}),
+                "fields": _USER_PATH_FIELDS
             })
-            print(user_paths, "user_paths")
-            return [{
-                "id": path.id,
-                "progress": getattr(path, 'progress', 0),
-                "completed_at": getattr(path, 'completed_at', None),
-                "roadmap_path_id": getattr(path, 'roadmap_path_id', None),
-                "created": getattr(path, 'created', None),
-                "updated": getattr(path, 'updated', None)
-            } for path in user_paths.items]
+            logger.debug("user_paths: %s", user_paths)
+            return [_row(path, _USER_PATH_KEYS, _USER_PATH_DEFAULTS) for path in user_paths.items]
         except Exception as e:
-            print(f"Error getting user roadmap paths: {e}")
+            logger.warning("Error getting user roadmap paths: %s", e)
             return []
     
     def update_user_progress(self, user_roadmap_path_id: str, progress: float, 
@@ -138,71 +251,131 @@ class UserProgressHelper:
                                     completed_at: str = None) -> Dict:
         """Save learning node completion to user_learning_node_progress table."""
         if not completed_at:
-            from datetime import datetime
-            completed_at = datetime.utcnow().isoformat() + "Z"
-        
-        # Check if already completed
-        existing_progress = self.pb.collection('user_learning_node_progress').get_list(1, 1, {
-            "filter": f"learning_node_id = '{learning_node_id}' && user_roadmap_path_id = '{user_roadmap_path_id}'"
-        })
+            completed_at = _utc_now_iso()
         
-        if existing_progress.items:
+        # Insert first; the unique (user_roadmap_path_id, learning_node_id) index turns a repeat into a 400
+        progress, created = self._create_or_get('user_learning_node_progress', {
+            "user_roadmap_path_id": user_roadmap_path_id,
+            "learning_node_id": learning_node_id,
+            "skill_id": skill_id,
+            "completed_at": completed_at
+        }, pb_filter("learning_node_id = {:learning_node_id} && user_roadmap_path_id = {:user_roadmap_path_id}", {"learning_node_id": learning_node_id, "user_roadmap_path_id": user_roadmap_path_id}))
+        if not created:
             # Update existing record
-            updated_progress = self.pb.collection('user_learning_node_progress').update(
-                existing_progress.items[0].id,
+            progress = self.pb.collection('user_learning_node_progress').update(
+                progress.id,
                 {"completed_at": completed_at}
             )
-            return {
-                "success": True,
-                "action": "updated",
-                "progress_id": updated_progress.id,
-                "completed_at": completed_at
-            }
-        else:
-            # Create new record
-            new_progress = self.pb.collection('user_learning_node_progress').create({
-                "user_roadmap_path_id": user_roadmap_path_id,
-                "learning_node_id": learning_node_id,
-                "skill_id": skill_id,
-                "completed_at": completed_at
-            })
-            return {
-                "success": True,
-                "action": "created",
-                "progress_id": new_progress.id,
-                "completed_at": completed_at
-            }
+        return {
+            "success": True,
+            "action": "created" if created else "updated",
+            "progress_id": progress.id,
+            "completed_at": completed_at
+        }
     
-    def get_user_learning_node_progress(self, user_id: str, user_roadmap_path_id: str = None) -> List[Dict]:
-        """Get user's learning node progress."""
-        filter_conditions = [f"user_roadmap_path_id.user_id = '{user_id}'"]
+    def save_learning_node_completions_bulk(self, user_roadmap_path_id: str, nodes: List[Dict]) -> Dict:
+        """Save many learning node completions with one lookup and one batch write."""
+        if not nodes:
+            return {"success": True, "created": 0, "updated": 0, "results": []}
+
+        default_completed_at = _utc_now_iso()
+
+        # Last entry wins if the same learning node is sent twice
+        by_node = {node["learning_node_id"]: node for node in nodes}
+
+        # 1) Fetch every existing row for these nodes in a single query
+        node_filter = " || ".join(pb_filter("learning_node_id = {:id}", {"id": node_id}) for node_id in by_node)
+        existing = self.pb.collection('user_learning_node_progress').get_full_list(200, {
+            "filter": pb_filter("user_roadmap_path_id = {:user_roadmap_path_id}", {"user_roadmap_path_id": user_roadmap_path_id}) + f" && ({node_filter})",
+            "fields": "id,learning_node_id"
+        })
+        existing_ids = {getattr(record, 'learning_node_id', ''): record.id for record in existing}
+
+        # 2) Split into inserts vs updates
+        records_url = "/api/collections/user_learning_node_progress/records"
+        requests = []
+        results = []
+        for node_id, node in by_node.items():
+            completed_at = node.get("completed_at") or default_completed_at
+            if node_id in existing_ids:
+                requests.append({
+                    "method": "PATCH",
+                    "url": f"{records_url}/{existing_ids[node_id]}",
+                    "body": {"completed_at": completed_at}
+                })
+                results.append({"learning_node_id": node_id, "action": "updated", "completed_at": completed_at})
+            else:
+                requests.append({
+                    "method": "POST",
+                    "url": records_url,
+                    "body": {
+                        "user_roadmap_path_id": user_roadmap_path_id,
+                        "learning_node_id": node_id,
+                        "skill_id": node["skill_id"],
+                        "completed_at": completed_at
+                    }
+                })
+                results.append({"learning_node_id": node_id, "action": "created", "completed_at": completed_at})
+
+        # 3) Send all writes in one batch round-trip
+        responses = self._send_batch(requests)
+        for result, response in zip(results, responses):
+            body = response.get("body") or {}
+            result["progress_id"] = body.get("id")
+
+        created = sum(1 for result in results if result["action"] == "created")
+        return {
+            "success": True,
+            "created": created,
+            "updated": len(results) - created,
+            "results": results
+        }
+
+    def get_user_learning_node_progress(self, user_id: str, user_roadmap_path_id: str = None,
+                                        page: int = None, per_page: int = None) -> List[Dict]:
+        """Get user's learning node progress, denormalized with its roadmap path and roadmap.
+
+        Returns every matching record unless page/per_page are given.
+        """
+        filter_conditions = [pb_filter("user_roadmap_path_id.user_id = {:user_id}", {"user_id": user_id})]
         if user_roadmap_path_id:
-            filter_conditions.append(f"user_roadmap_path_id = '{user_roadmap_path_id}'")
-        
-        progress_records = self.pb.collection('user_learning_node_progress').get_list(1, 100, {
+            filter_conditions.append(pb_filter("user_roadmap_path_id = {:user_roadmap_path_id}", {"user_roadmap_path_id": user_roadmap_path_id}))
+        query = {
             "filter": " && ".join(filter_conditions),
-            "expand": "user_roadmap_path_id"
-        })
+            # Expand the whole chain in the same query so callers don't look up paths/roadmaps per record
+            "expand": "user_roadmap_path_id.roadmap_path_id.roadmap_id",
+            "fields": _NODE_PROGRESS_FIELDS
+        }
+        
+        collection = self.pb.collection('user_learning_node_progress')
+        if page is not None or per_page is not None:
+            records = collection.get_list(page or 1, per_page or 100, query).items
+        else:
+            records = collection.get_full_list(200, query)
         
-        return [{
-            "id": record.id,
-            "learning_node_id": getattr(record, 'learning_node_id', ''),
-            "skill_id": getattr(record, 'skill_id', ''),
-            "user_roadmap_path_id": getattr(record, 'user_roadmap_path_id', ''),
-            "completed_at": getattr(record, 'completed_at', None),
-            "created": getattr(record, 'created', None),
-            "updated": getattr(record, 'updated', None)
-        } for record in progress_records.items]
+        results = []
+        for record in records:
+            user_path = _expanded(record, 'user_roadmap_path_id')
+            roadmap_path = _expanded(user_path, 'roadmap_path_id')
+            roadmap = _expanded(roadmap_path, 'roadmap_id')
+            row = _row(record, _NODE_PROGRESS_KEYS, _NODE_PROGRESS_DEFAULTS)
+            row.update({
+                "path_progress": getattr(user_path, 'progress', None),
+                "roadmap_path_id": getattr(user_path, 'roadmap_path_id', None),
+                "roadmap_path_name": getattr(roadmap_path, 'name', None),
+                "roadmap_id": getattr(roadmap_path, 'roadmap_id', None),
+                "roadmap_name": getattr(roadmap, 'name', None)
+            })
+            results.append(row)
+        return results
     
     def remove_learning_node_completion(self, user_id: str, learning_node_id: str, 
                                       user_roadmap_path_id: str) -> Dict:
         """Remove learning node completion (mark as incomplete)."""
-        existing_progress = self.pb.collection('user_learning_node_progress').get_list(1, 1, {
-            "filter": f"learning_node_id = '{learning_node_id}' && user_roadmap_path_id = '{user_roadmap_path_id}'"
-        })
+        existing_progress = self._first_or_none('user_learning_node_progress', pb_filter("learning_node_id = {:learning_node_id} && user_roadmap_path_id = {:user_roadmap_path_id}", {"learning_node_id": learning_node_id, "user_roadmap_path_id": user_roadmap_path_id}))
         
-        if existing_progress.items:
-            self.pb.collection('user_learning_node_progress').delete(existing_progress.items[0].id)
+        if existing_progress is not None:
+            self.pb.collection('user_learning_node_progress').delete(existing_progress.id)
             return {
                 "success": True,
                 "action": "removed",
@@ -222,18 +395,20 @@ class UserProgressHelper:
             # Note: We need to find by skill name since we don't have the skill ID directly
             # This assumes skill_name matches the skill_id in the database
             skill_records = self.pb.collection('roadmap_path_skills').get_list(1, 100, {
-                "filter": f"skill_id = '{skill_name}'"
+                "filter": pb_filter("skill_id = {:skill_name}", {"skill_name": skill_name}),
+                "fields": "id,learning_nodes_count"
             })
-            print(f"Skill records: {skill_records}")
-            updated_count = 0
-            for record in skill_records.items:
-                # Only update if the count is different (avoid unnecessary updates)
-                current_count = getattr(record, 'learning_nodes_count', 0)
-                if current_count != learning_nodes_count:
-                    self.pb.collection('roadmap_path_skills').update(record.id, {
-                        "learning_nodes_count": learning_nodes_count
-                    })
-                    updated_count += 1
+            logger.debug("Skill records: %s", skill_records)
+            # Only update records whose count differs, all in one batch request
+            updates = [{
+                "method": "PATCH",
+                "url": f"/api/collections/roadmap_path_skills/records/{record.id}",
+                "body": {"learning_nodes_count": learning_nodes_count}
+            } for record in skill_records.items
+                if getattr(record, 'learning_nodes_count', 0) != learning_nodes_count]
+            if updates:
+                self._send_batch(updates)
+            updated_count = len(updates)
             
             return {
                 "success": True,
@@ -254,15 +429,11 @@ class UserProgressHelper:
     def update_learning_nodes_count_by_ids(self, roadmap_path_id: str, skill_id: str, learning_nodes_count: int) -> Dict:
         """Update learning_nodes_count in roadmap_path_skills filtered by both roadmap_path_id and skill_id."""
         try:
-            records = self.pb.collection('roadmap_path_skills').get_list(1, 5, {
-                "filter": f"roadmap_path_id = '{roadmap_path_id}' && skill_id = '{skill_id}'"
-            })
-            print(f"Records: {records}")
-            if not records.items:
+            record = self._first_or_none('roadmap_path_skills', pb_filter("roadmap_path_id = {:roadmap_path_id} && skill_id = {:skill_id}", {"roadmap_path_id": roadmap_path_id, "skill_id": skill_id}), "id,learning_nodes_count")
+            if record is None:
                 return {"success": False, "error": "record_not_found", "roadmap_path_id": roadmap_path_id, "skill_id": skill_id}
 
-            print(f"Record: {records.items[0]}")
-            record = records.items[0]
+            logger.debug("Record: %s", record)
             current_count = getattr(record, 'learning_nodes_count', 0)
             if current_count == learning_nodes_count:
                 return {"success": True, "records_updated": 0, "learning_nodes_count": learning_nodes_count}
@@ -270,7 +441,7 @@ class UserProgressHelper:
             self.pb.collection('roadmap_path_skills').update(record.id, {
                 "learning_nodes_count": learning_nodes_count
             })
-            print(f"Record updated: {record}")
+            logger.debug("Record updated: %s", record)
             return {"success": True, "records_updated": 1, "learning_nodes_count": learning_nodes_count}
         except Exception as e:
             return {"success": False, "error": str(e), "roadmap_path_id": roadmap_path_id, "skill_id": skill_id}
@@ -279,7 +450,7 @@ class UserProgressHelper:
         """Get skills from a user roadmap path, ordered by order_index."""
         # try:
         # First get the roadmap_path_id from user_roadmap_path
-        user_path = self.pb.collection('user_roadmap_path').get_one(user_roadmap_path_id)
+        user_path = self.pb.collection('user_roadmap_path').get_one(user_roadmap_path_id, {"fields": "id,roadmap_path_id"})
         roadmap_path_id = getattr(user_path, 'roadmap_path_id', None)
         
         if not roadmap_path_id:
@@ -287,8 +458,9 @@ class UserProgressHelper:
         
         # Get all skills for this roadmap path, ordered by order_index
         skills_records = self.pb.collection('roadmap_path_skills').get_list(1, 100, {
-            "filter": f"roadmap_path_id = '{roadmap_path_id}'",
-            "sort": "order_index"
+            "filter": pb_filter("roadmap_path_id = {:roadmap_path_id}", {"roadmap_path_id": roadmap_path_id}),
+            "sort": "order_index",
+            "fields": "skill_id,order_index,learning_nodes_count"
         })
         
         skills = []
@@ -329,7 +501,8 @@ class UserProgressHelper:
             try:
                 # Get all progress records for this skill
                 all_records = self.pb.collection('user_learning_node_progress').get_list(1, 100, {
-                    "filter": f"user_roadmap_path_id = '{user_roadmap_path_id}' && skill_id = '{skill_id}'"
+                    "filter": pb_filter("user_roadmap_path_id = {:user_roadmap_path_id} && skill_id = {:skill_id}", {"user_roadmap_path_id": user_roadmap_path_id, "skill_id": skill_id}),
+                    "fields": "completed_at"
                 })
                 
                 # Count records where completed_at is not null/empty
@@ -339,7 +512,7 @@ class UserProgressHelper:
                         completed_count += 1
                         
             except Exception as filter_error:
-                print(f"Error querying user_learning_node_progress collection: {filter_error}")
+                logger.warning("Error querying user_learning_node_progress collection: %s", filter_error)
                 # If the collection doesn't exist or has issues, return 0 progress
                 completed_count = 0
             
@@ -352,6 +525,15 @@ class UserProgressHelper:
             }
             
         except Exception as e:
-            print(f"Error getting user skill progress: {e}")
+            logger.warning("Error getting user skill progress: %s", e)
             return {"completed": 0, "total": 0, "percentage": 0}
-    
\ No newline at end of file
+    
+
+def get_progress_helper() -> UserProgressHelper:
+    """Process-wide helper bound to the current admin client; rebuilt only when that client is re-created."""
+    global _shared_helper
+    pb = get_pb_admin_client()
+    helper = _shared_helper
+    if helper is None or helper.pb is not pb:
+        helper = _shared_helper = UserProgressHelper(pb)
+    return helper
@@ -0,0 +1,36 @@
+"""
+Message conversion shared by the LLM clients.
+
+Fully annotated and free of dynamic tricks so it can be compiled with mypyc
+(`mypyc llm/_msgbuild.py`); the compiled extension then shadows this module
+under the same import, and the pure-Python version keeps working without it.
+"""
+from functools import lru_cache
+from typing import Optional
+from langchain_core.messages import (
+    BaseMessage,
+    SystemMessage,
+    HumanMessage,
+    AIMessage,
+)
+
+# Order matters: within one dict the AI turn precedes the user's reply
+_ROLES: tuple[tuple[str, type[BaseMessage]], ...] = (("ai", AIMessage), ("user", HumanMessage))
+
+
+@lru_cache(maxsize=64)
+def system_message(content: str) -> SystemMessage:
+    """SystemMessage for a prompt, reused since system prompts rarely change between turns."""
+    return SystemMessage(content=content)
+
+
+def build_messages(messages: list[dict[str, str]], system_prompt: Optional[str] = None) -> list[BaseMessage]:
+    """Convert {'user'/'ai'} dicts into LangChain messages."""
+    chat_messages: list[BaseMessage] = [system_message(system_prompt)] if system_prompt else []
+    chat_messages += [
+        cls(content=msg[key])
+        for msg in messages
+        for key, cls in _ROLES
+        if msg.get(key)
+    ]
+    return chat_messages
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Iterator, Optional
+from langchain_core.messages import HumanMessage
+from llm._msgbuild import build_messages
+
+logger = logging.getLogger(__name__)
+
+# Default cap on concurrent requests in chat_batch (keeps bursts under provider rate limits)
+CHAT_BATCH_CONCURRENCY = 4
+
+
+class BaseLLMClient:
+    """Shared chat interface; subclasses only set self.model and self.llm"""
+
+    # Used in error messages
+    provider_name = "LLM"
+
+    def chat(self, messages: list[dict], system_prompt: Optional[str] = None) -> str:
+        """
+        Main chat function
+
+        Args:
+            messages: List of message dictionaries with 'user' and/or 'ai' keys
+            system_prompt: Optional system prompt to set context
+
+        Returns:
+            LLM response content
+        """
+        # Send the message to the model
+        response = self.llm.invoke(self._build_messages(messages, system_prompt))
+        return response.content
+
+    async def achat(self, messages: list[dict], system_prompt: Optional[str] = None) -> str:
+        """Async variant of chat()."""
+        response = await self.llm.ainvoke(self._build_messages(messages, system_prompt))
+        return response.content
+
+    async def chat_batch(self, batches: list[list[dict]], system_prompt: Optional[str] = None,
+                         concurrency: int = CHAT_BATCH_CONCURRENCY) -> list[str]:
+        """Run independent conversations concurrently (at most `concurrency` in flight); results keep input order."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(messages: list[dict]) -> str:
+            async with semaphore:
+                return await self.achat(messages, system_prompt)
+
+        return await asyncio.gather(*(run(messages) for messages in batches))
+
+    def chat_stream(self, messages: list[dict], system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Yield response text chunks as they arrive instead of waiting for the full completion."""
+        for chunk in self.llm.stream(self._build_messages(messages, system_prompt)):
+            if chunk.content:
+                yield chunk.content
+
+    async def astream_chat(self, messages: list[dict], system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """Async variant of chat_stream()."""
+        async for chunk in self.llm.astream(self._build_messages(messages, system_prompt)):
+            if chunk.content:
+                yield chunk.content
+
+    @staticmethod
+    def _build_messages(messages: list[dict], system_prompt: Optional[str] = None) -> list:
+        """Convert {'user'/'ai'} dicts into LangChain messages."""
+        return build_messages(messages, system_prompt)
+
+    def chat_simple(self, prompt: str) -> str:
+        """
+        Simple chat function for single prompt
+
+        Args:
+            prompt: The user prompt/message
+
+        Returns:
+            LLM response content
+        """
+        try:
+            response = self.llm.invoke([HumanMessage(content=prompt)])
+            return response.content
+        except Exception as e:
+            logger.warning("Error in %s chat_simple: %s", self.provider_name, e)
+            return f"I encountered an error: {str(e)}"
+
+    def bind_tools(self, tools: list[dict]):
+        """
+        Bind tools to the LLM
+        """
+        self.llm = self.llm.bind_tools(tools)
+        return self.llm
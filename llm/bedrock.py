@@ -1,17 +1,15 @@
 from langchain_aws import ChatBedrock
-from langchain_core.messages import (
-    SystemMessage,
-    HumanMessage,
-    AIMessage,
-)
 from typing import Optional
 import os
 from config import app_config
+from llm.base import BaseLLMClient
 
 
-class BedrockClient:
+class BedrockClient(BaseLLMClient):
     """AWS Bedrock client class for handling LLM interactions"""
     
+    provider_name = "Bedrock"
+    
     def __init__(self, model: str = None):
         # Use provided model or fallback to config or default
         self.model = app_config.model
@@ -42,62 +40,6 @@ class BedrockClient:
             )
         except Exception as e:
             print(f"Warning: Could not initialize Bedrock with model '{self.model}': {e}")
-    
-    def chat(self, messages: list[dict], system_prompt: Optional[str] = None) -> str:
-        """
-        Main chat function using AWS Bedrock
-        
-        Args:
-            messages: List of message dictionaries with 'user' and/or 'ai' keys
-            system_prompt: Optional system prompt to set context
-            
-        Returns:
-            LLM response content
-        """
-        chat_messages = []
-        
-        # Add system message if provided
-        if system_prompt:
-            chat_messages.append(SystemMessage(content=system_prompt))
-        
-        # Process messages
-        for msg in messages:
-            if "ai" in msg and msg["ai"]:
-                chat_messages.append(AIMessage(content=msg["ai"]))
-            if "user" in msg and msg["user"]:
-                chat_messages.append(HumanMessage(content=msg["user"]))
-        
-        # Send the message to the model
-        response = self.llm.invoke(chat_messages)
-        return response.content
-    
-    def chat_simple(self, prompt: str) -> str:
-        """
-        Simple chat function for single prompt
-        
-        Args:
-            prompt: The user prompt/message
-            
-        Returns:
-            LLM response content
-        """
-        try:
-            # Create a simple message list
-            messages = [HumanMessage(content=prompt)]
-            
-            # Send the message to the model
-            response = self.llm.invoke(messages)
-            return response.content
-        except Exception as e:
-            print(f"Error in Bedrock chat_simple: {e}")
-            return f"I encountered an error: {str(e)}"
-
-    def bind_tools(self, tools: list[dict]):
-        """
-        Bind tools to the LLM
-        """
-        self.llm = self.llm.bind_tools(tools)
-        return self.llm
 
 
 # Legacy function for backward compatibility
@@ -0,0 +1,18 @@
+from functools import lru_cache
+from config import app_config
+
+
+@lru_cache(maxsize=1)
+def get_response_cache():
+    """SQLite-backed LangChain cache at LLM_CACHE_PATH, or None when response caching is off."""
+    if not app_config.llm_cache_path:
+        return None
+    from langchain_community.cache import SQLiteCache
+    return SQLiteCache(database_path=app_config.llm_cache_path)
+
+
+def enable_response_cache(llm) -> None:
+    """Attach the response cache to a deterministic (temperature 0) model; sampled outputs are meant to vary."""
+    cache = get_response_cache()
+    if cache is not None and getattr(llm, "temperature", None) == 0:
+        llm.cache = cache
@@ -1,18 +1,47 @@
 from langchain_groq import ChatGroq
-from langchain_core.messages import (
-    SystemMessage,
-    HumanMessage,
-    AIMessage,
-)
-from typing import Optional
+from functools import lru_cache
+from typing import AsyncIterator, Optional
 import os
+import httpx
 from config import app_config
+from llm.base import BaseLLMClient
+from llm.cache import enable_response_cache
 
 
-class GroqClient:
+# Long-lived HTTP clients shared by every ChatGroq instance so calls reuse
+# pooled keep-alive (HTTP/2) connections instead of a fresh TLS handshake each time
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Return the shared (sync, async) httpx clients, creating them on first use."""
+    global _http_client, _http_async_client
+    if _http_client is None:
+        _http_client = httpx.Client(http2=True, timeout=30, limits=_HTTP_LIMITS)
+    if _http_async_client is None:
+        _http_async_client = httpx.AsyncClient(http2=True, timeout=30, limits=_HTTP_LIMITS)
+    return _http_client, _http_async_client
+
+
+async def close_http_clients() -> None:
+    """Close the shared httpx clients (called on app shutdown)."""
+    global _http_client, _http_async_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+    if _http_async_client is not None:
+        await _http_async_client.aclose()
+        _http_async_client = None
+
+
+class GroqClient(BaseLLMClient):
     """Groq client class for handling LLM interactions"""
     
-    def __init__(self, model: str = None):
+    provider_name = "Groq"
+    
+    def __init__(self, model: str = None, llm: Optional[ChatGroq] = None):
         # Use provided model or fallback to config or default
         self.model = "llama-3.1-8b-instant" # model or app_config.model or 
         
@@ -24,7 +53,13 @@ class GroqClient:
         
         if not self.api_key:
             raise ValueError("GROQ_API_KEY environment variable is required")
+        
+        if llm is not None:
+            # Already configured ChatGroq (shared through _get_llm)
+            self.llm = llm
+            return
             
+        http_client, http_async_client = get_http_clients()
         try:
             # Initialize ChatGroq LLM
             self.llm = ChatGroq(
@@ -32,7 +67,9 @@ class GroqClient:
                 api_key=self.api_key,
                 temperature=0.5,
                 max_tokens=300,
-                top_p=0.95
+                top_p=0.95,
+                http_client=http_client,
+                http_async_client=http_async_client
             )
         except Exception as e:
             print(f"Warning: Could not initialize Groq with model '{self.model}': {e}")
@@ -43,64 +80,10 @@ class GroqClient:
                 api_key=self.api_key,
                 temperature=0.5,
                 max_tokens=300,
-                top_p=0.95
+                top_p=0.95,
+                http_client=http_client,
+                http_async_client=http_async_client
             )
-    
-    def chat(self, messages: list[dict], system_prompt: Optional[str] = None) -> str:
-        """
-        Main chat function using Groq
-        
-        Args:
-            messages: List of message dictionaries with 'user' and/or 'ai' keys
-            system_prompt: Optional system prompt to set context
-            
-        Returns:
-            LLM response content
-        """
-        chat_messages = []
-        
-        # Add system message if provided
-        if system_prompt:
-            chat_messages.append(SystemMessage(content=system_prompt))
-        
-        # Process messages
-        for msg in messages:
-            if "ai" in msg and msg["ai"]:
-                chat_messages.append(AIMessage(content=msg["ai"]))
-            if "user" in msg and msg["user"]:
-                chat_messages.append(HumanMessage(content=msg["user"]))
-        
-        # Send the message to the model
-        response = self.llm.invoke(chat_messages)
-        return response.content
-    
-    def chat_simple(self, prompt: str) -> str:
-        """
-        Simple chat function for single prompt
-        
-        Args:
-            prompt: The user prompt/message
-            
-        Returns:
-            LLM response content
-        """
-        try:
-            # Create a simple message list
-            messages = [HumanMessage(content=prompt)]
-            
-            # Send the message to the model
-            response = self.llm.invoke(messages)
-            return response.content
-        except Exception as e:
-            print(f"Error in Groq chat_simple: {e}")
-            return f"I encountered an error: {str(e)}"
-
-    def bind_tools(self, tools: list[dict]):
-        """
-        Bind tools to the LLM
-        """
-        self.llm = self.llm.bind_tools(tools)
-        return self.llm
 
 
 # Legacy function for backward compatibility
@@ -115,11 +98,55 @@ def call_groq_model(
     """
     Legacy function - use GroqClient class instead
     """
-    client = GroqClient(model=model)
-    client.llm.temperature = temperature
-    client.llm.max_tokens = max_tokens
-    client.llm.top_p = top_p
+    client = _get_client(model, os.getenv("GROQ_API_KEY"), temperature, max_tokens, top_p, tuple(stop) if stop else None)
+    return client.chat(messages, system_prompt)
+
+
+async def call_groq_model_async(
+    messages: list[dict], 
+    system_prompt: Optional[str], 
+    model: str,
+    temperature: float = 0.5,
+    max_tokens: int = 300,
+    top_p: float = 0.95,
+    stop: list = None):
+    """
+    Async counterpart of call_groq_model using the shared keep-alive client
+    """
+    client = _get_client(model, os.getenv("GROQ_API_KEY"), temperature, max_tokens, top_p, tuple(stop) if stop else None)
+    return await client.achat(messages, system_prompt)
+
+
+async def call_groq_model_stream(
+    messages: list[dict], 
+    system_prompt: Optional[str], 
+    model: str,
+    temperature: float = 0.5,
+    max_tokens: int = 300,
+    top_p: float = 0.95,
+    stop: list = None) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of call_groq_model: async generator over text chunks,
+    suitable for StreamingResponse(..., media_type="text/event-stream")
+    """
+    client = _get_client(model, os.getenv("GROQ_API_KEY"), temperature, max_tokens, top_p, tuple(stop) if stop else None)
+    async for chunk in client.astream_chat(messages, system_prompt):
+        yield chunk
+
+
+@lru_cache(maxsize=32)
+def _get_llm(model, api_key, temperature, max_tokens, top_p, stop: Optional[tuple]) -> ChatGroq:
+    """Configured ChatGroq, built once per distinct settings (api_key keys the cache so a rotated key gets a new one)."""
+    llm = GroqClient(model=model).llm
+    llm.temperature = temperature
+    llm.max_tokens = max_tokens
+    llm.top_p = top_p
     if stop:
-        client.llm.stop = stop
-    
-    return client.chat(messages, system_prompt)
\ No newline at end of file
+        llm.stop = list(stop)
+    enable_response_cache(llm)
+    return llm
+
+
+def _get_client(model, api_key, temperature, max_tokens, top_p, stop: Optional[tuple]) -> GroqClient:
+    """GroqClient over the shared ChatGroq for these settings; a new wrapper per call so bind_tools stays with the caller."""
+    return GroqClient(model=model, llm=_get_llm(model, api_key, temperature, max_tokens, top_p, stop))
@@ -0,0 +1,41 @@
+/// <reference path="../pb_data/types.d.ts" />
+// Indexes for the filters used by the progress, roadmap and notes endpoints
+const INDEXES = {
+  // user_learning_node_progress: lookups by path + node, per-skill counts, completed rows only
+  "pbc_2719533596": [
+    "CREATE INDEX `idx_lnp_path_node` ON `user_learning_node_progress` (`user_roadmap_path_id`, `learning_node_id`)",
+    "CREATE INDEX `idx_lnp_path_skill` ON `user_learning_node_progress` (`user_roadmap_path_id`, `skill_id`)",
+    "CREATE INDEX `idx_lnp_done` ON `user_learning_node_progress` (`user_roadmap_path_id`) WHERE `completed_at` != ''"
+  ],
+  // user_roadmap_path: per-user listing and the (user, path) existence check
+  "pbc_2944177148": [
+    "CREATE INDEX `idx_urp_user_path` ON `user_roadmap_path` (`user_id`, `roadmap_path_id`)"
+  ],
+  // roadmap_path_skills: ordered skills of a path, learning node count updates by skill
+  "pbc_445752313": [
+    "CREATE INDEX `idx_rps_path_order` ON `roadmap_path_skills` (`roadmap_path_id`, `order_index`)",
+    "CREATE INDEX `idx_rps_skill` ON `roadmap_path_skills` (`skill_id`)"
+  ],
+  // roadmap_paths: dedupe by skill sequence hash
+  "pbc_3258806628": [
+    "CREATE INDEX `idx_rp_sequence_hash` ON `roadmap_paths` (`skill_sequence_hash`)"
+  ],
+  // notes: per-user listing
+  "pbc_3395098727": [
+    "CREATE INDEX `idx_notes_user` ON `notes` (`user_id`)"
+  ]
+};
+
+migrate((app) => {
+  for (const [collectionId, indexes] of Object.entries(INDEXES)) {
+    const collection = app.findCollectionByNameOrId(collectionId);
+    unmarshal({ "indexes": indexes }, collection);
+    app.save(collection);
+  }
+}, (app) => {
+  for (const collectionId of Object.keys(INDEXES)) {
+    const collection = app.findCollectionByNameOrId(collectionId);
+    unmarshal({ "indexes": [] }, collection);
+    app.save(collection);
+  }
+})
@@ -1,11 +1,12 @@
 from operator import le
 import kuzu
-import json
 import os
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from pathlib import Path
 
+from helper.json_fast import loads_path
+
 class KuzuSkillGraph:
     """
     KuzuDB integration for storing and managing learning roadmap skills as a graph database.
@@ -78,14 +79,12 @@ class KuzuSkillGraph:
         
         print("KuzuDB comprehensive schema created successfully!")
     
-    def load_skills_from_files(self, skills_list: List[str], data_dir: str = "data"):
-        """Load skills from JSON roadmap files into KuzuDB."""
-        order_index = 0
+    def load_skills_from_files(self, skills: Sequence[Tuple[str, int]], data_dir: str = "data"):
+        """Load skills from JSON roadmap files into KuzuDB; skills are (name, order_index) pairs."""
         skill_id_mapping = {}
-        for skill in skills_list:
+        for skill, order_index in skills:
             print(skill)
             self._load_single_skill(skill, data_dir, order_index, skill_id_mapping)
-            order_index += 1
         return skill_id_mapping
     
     def _load_single_skill(self, skill_name: str, data_dir: str, order_index: int, skill_id_mapping: Dict[str, str]):
@@ -97,8 +96,7 @@ class KuzuSkillGraph:
             print(f"Warning: Roadmap file not found for skill: {skill_name} at {file_path}")
             return skill_id_mapping
         # try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            skill_data = json.load(f)
+        skill_data = loads_path(file_path)
         
         # Insert skill node
         skill_id = str(uuid.uuid4())
@@ -312,6 +310,16 @@ class KuzuSkillGraph:
         
         print(f"Added skill connection: {from_skill} -> {to_skill}")
     
+    def bulk_add_connections(self, pairs: List[Dict[str, str]]):
+        """Add many skill connections ({"from_id", "to_id"} dicts) with a single UNWIND query."""
+        if not pairs:
+            return
+        self.conn.execute("""
+            UNWIND $pairs AS pair
+            MATCH (from:Skill {id: pair.from_id}), (to:Skill {id: pair.to_id})
+            MERGE (from)-[:SKILL_CONNECTION]->(to)
+        """, parameters={"pairs": pairs})
+    
     def add_skill_connections_from_progression(self, skill_id_mapping: Dict[str, str]):
         """Add skill connections based on logical learning progression from the skills list."""
         # Define the logical learning progression connections
@@ -533,14 +541,16 @@ class KuzuSkillGraph:
         ]
 
         
-        # Add all connections
+        # Resolve names to ids, then add all connections in one statement
+        pairs = []
         for from_skill, to_skill in connections:
-            try:
-                self.add_skill_connection(skill_id_mapping[from_skill], skill_id_mapping[to_skill])
-            except Exception as e:
-                print(f"Warning: Could not add connection {from_skill} -> {to_skill}: {str(e)}")
+            if from_skill not in skill_id_mapping or to_skill not in skill_id_mapping:
+                print(f"Warning: Could not add connection {from_skill} -> {to_skill}: unknown skill")
+                continue
+            pairs.append({"from_id": skill_id_mapping[from_skill], "to_id": skill_id_mapping[to_skill]})
+        self.bulk_add_connections(pairs)
         
-        print(f"Added {len(connections)} skill connections based on learning progression")
+        print(f"Added {len(pairs)} skill connections based on learning progression")
     
     def get_skill_info(self, skill_name: str) -> Dict[str, Any]:
         """Retrieve information for a specific skill."""
@@ -965,38 +975,43 @@ class KuzuSkillGraph:
         """Close the database connection."""
         self.conn.close()
 
+# Skills in learning order, each paired with its order_index (beginner -> advanced)
+_SKILL_ORDER = (
+    "computer science", "datastructures and algorithms", 
+    "python", "java", "cpp", "javascript", 
+    "git github", "sql", 
+    "frontend", "backend", 
+    "react", "angular", "vue", 
+    "nodejs", "php", "spring boot", "aspnet core", 
+    "full stack", "nextjs", 
+    "typescript", "graphql", 
+    "mongodb", "postgresql dba", "redis", 
+    "android", "ios", "flutter", "react native", 
+    "game developer", "server side game developer", 
+    "design system", "ux design", 
+    "code review", "qa", 
+    "bi analyst", "data analyst", 
+    "data engineer", "aws", 
+    "devops", "docker", "linux", 
+    "kubernetes", "terraform", "cloudflare", 
+    "cyber security", "ai red teaming", 
+    "blockchain", "golang", "rust", 
+    "system design", "software design architecture", 
+    "software architect", "engineering manager", "product manager", "devrel", "technical writer", 
+    "machine learning", "prompt engineering", 
+    "mlops", "ai engineer", 
+    "ai data scientist", "ai agents",
+)
+SKILL_PROGRESSION: Tuple[Tuple[str, int], ...] = tuple(
+    (name, order_index) for order_index, name in enumerate(_SKILL_ORDER)
+)
+
 # Initialize the skill graph
 def initialize_skill_graph():
     """ Initialize and populate the KuzuDB skill graph with all roadmap data. """
-    skills = [
-        "computer science", "datastructures and algorithms", 
-        "python", "java", "cpp", "javascript", 
-        "git github", "sql", 
-        "frontend", "backend", 
-        "react", "angular", "vue", 
-        "nodejs", "php", "spring boot", "aspnet core", 
-        "full stack", "nextjs", 
-        "typescript", "graphql", 
-        "mongodb", "postgresql dba", "redis", 
-        "android", "ios", "flutter", "react native", 
-        "game developer", "server side game developer", 
-        "design system", "ux design", 
-        "code review", "qa", 
-        "bi analyst", "data analyst", 
-        "data engineer", "aws", 
-        "devops", "docker", "linux", 
-        "kubernetes", "terraform", "cloudflare", 
-        "cyber security", "ai red teaming", 
-        "blockchain", "golang", "rust", 
-        "system design", "software design architecture", 
-        "software architect", "engineering manager", "product manager", "devrel", "technical writer", 
-        "machine learning", "prompt engineering", 
-        "mlops", "ai engineer", 
-        "ai data scientist", "ai agents"
-    ]
     # Create and populate the graph
     skill_graph = KuzuSkillGraph()
-    skill_id_mapping = skill_graph.load_skills_from_files(skills)
+    skill_id_mapping = skill_graph.load_skills_from_files(SKILL_PROGRESSION)
     
     # Add skill connections based on logical learning progression
     print("\nAdding skill connections from basic to advanced...")
@@ -50,75 +50,55 @@ async def verify_api_key(x_api_key: str = Header(None)):
 @router.get("/skills", response_model=SkillsResponse, dependencies=[Depends(verify_api_key)])
 async def get_all_skills():
     """Get all available skills from the database"""
-    try:
-        if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
-            raise HTTPException(status_code=500, detail="Database not initialized")
-        
-        skills = deps.kuzu_manager.get_all_skills()
-        return SkillsResponse(skills=skills, status="success")
+    if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
+        raise HTTPException(status_code=500, detail="Database not initialized")
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving skills: {str(e)}")
+    skills = deps.kuzu_manager.get_all_skills()
+    return SkillsResponse(skills=skills, status="success")
 
 @router.get("/skill-connections", response_model=ConnectionsResponse, dependencies=[Depends(verify_api_key)])
 async def get_skill_connections():
     """Get all skill connections from the database"""
-    try:
-        if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
-            raise HTTPException(status_code=500, detail="Database not initialized")
-        
-        connections = deps.kuzu_manager.get_all_skill_connections()
-        return ConnectionsResponse(connections=connections, status="success")
+    if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
+        raise HTTPException(status_code=500, detail="Database not initialized")
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving skill connections: {str(e)}")
+    connections = deps.kuzu_manager.get_all_skill_connections()
+    return ConnectionsResponse(connections=connections, status="success")
 
 @router.post("/learning-path", response_model=LearningPathResponse, dependencies=[Depends(verify_api_key)])
 async def find_learning_path(request: LearningPathRequest):
     """Find learning path between two skills"""
-    try:
-        if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
-            raise HTTPException(status_code=500, detail="Database not initialized")
-        
-        path_objects = deps.kuzu_manager.find_learning_path_using_bfs(
-            request.start_skill, 
-            request.target_skill
-        )
-        
-        # Convert skill IDs to skill details
-        path_with_details = []
-        for skill_id in path_objects:
-            skill_info = deps.kuzu_manager.get_skill_by_id(skill_id)
-            if skill_info:
-                path_with_details.append(skill_info)
-        
-        return LearningPathResponse(path=path_with_details, status="success")
+    if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
+        raise HTTPException(status_code=500, detail="Database not initialized")
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error finding learning path: {str(e)}")
+    path_objects = deps.kuzu_manager.find_learning_path_using_bfs(
+        request.start_skill, 
+        request.target_skill
+    )
+    
+    # Convert skill IDs to skill details
+    path_with_details = []
+    for skill_id in path_objects:
+        skill_info = deps.kuzu_manager.get_skill_by_id(skill_id)
+        if skill_info:
+            path_with_details.append(skill_info)
+    
+    return LearningPathResponse(path=path_with_details, status="success")
 
 @router.get("/skill-prerequisites", response_model=PrerequisitesResponse, dependencies=[Depends(verify_api_key)])
 async def get_skill_prerequisites(skill_name: str = Query(..., description="Name of the skill")):
     """Get prerequisites for a specific skill"""
-    try:
-        if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
-            raise HTTPException(status_code=500, detail="Database not initialized")
-        
-        prerequisites = deps.kuzu_manager.get_skill_prerequisites_by_name(skill_name)
-        return PrerequisitesResponse(prerequisites=prerequisites, status="success")
+    if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
+        raise HTTPException(status_code=500, detail="Database not initialized")
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving prerequisites: {str(e)}")
+    prerequisites = deps.kuzu_manager.get_skill_prerequisites_by_name(skill_name)
+    return PrerequisitesResponse(prerequisites=prerequisites, status="success")
 
 @router.get("/skill-details", response_model=SkillDetailsResponse, dependencies=[Depends(verify_api_key)])
 async def get_skill_details(skill_name: str = Query(..., description="Name of the skill")):
     """Get detailed information about a specific skill"""
-    try:
-        if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
-            raise HTTPException(status_code=500, detail="Database not initialized")
-        
-        skill_info = deps.kuzu_manager.get_skill_info(skill_name)
-        return SkillDetailsResponse(skill=skill_info, status="success")
+    if not hasattr(deps, 'kuzu_manager') or deps.kuzu_manager is None:
+        raise HTTPException(status_code=500, detail="Database not initialized")
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving skill details: {str(e)}")
+    skill_info = deps.kuzu_manager.get_skill_info(skill_name)
+    return SkillDetailsResponse(skill=skill_info, status="success")
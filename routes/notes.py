@@ -1,8 +1,7 @@
 from fastapi import Request, HTTPException, APIRouter
-from fastapi.responses import RedirectResponse, HTMLResponse
-from config import app_config
-from deps import templates
+from fastapi.concurrency import run_in_threadpool
 from helper.helper import get_current_user
+from helper.pocketbase_helper import pb_filter
 from typing import Optional
 from schemas.notes import NoteCreate, NoteUpdate
 
@@ -11,241 +10,202 @@ router = APIRouter(
     tags=["Notes"],
 )
 
-# Notes page route
-@router.get("/notes", response_class=HTMLResponse)
-async def notes_page(request: Request):
-    """Notes page."""
-    user = get_current_user(request)
-    if not user:
-        return RedirectResponse(url=f"{app_config.url_prefix}/login", status_code=302)
-    
-    return templates.TemplateResponse("notes_content.html", {
-        "request": request,
-        "title": "Notes",
-        "user": user
-    })
-
 # API Routes for Notes CRUD operations
 
 @router.get("/api/user/notes")
 async def get_user_notes(request: Request, search: Optional[str] = None, tag: Optional[str] = None, favorite: Optional[bool] = None):
     """Get all notes for the current user with optional filtering."""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    # Build filter conditions
+    filter_conditions = ["user_id = {:user_id}"]
+    
+    if search:
+        filter_conditions.append("(title ~ {:search} || content ~ {:search})")
+    
+    if tag:
+        filter_conditions.append("tags ~ {:tag}")
+    
+    if favorite is not None:
+        filter_conditions.append("is_favorite = {:favorite}")
+    
     try:
-        user = get_current_user(request)
-        if not user:
-            raise HTTPException(status_code=401, detail="Not authenticated")
-        
-        # Build filter conditions
-        filter_conditions = [f"user_id = '{user.id}'"]
-        
-        if search:
-            filter_conditions.append(f"(title ~ '{search}' || content ~ '{search}')")
-        
-        if tag:
-            filter_conditions.append(f"tags ~ '{tag}'")
-        
-        if favorite is not None:
-            filter_conditions.append(f"is_favorite = {str(favorite).lower()}")
-        
-        filter_string = " && ".join(filter_conditions)
-        
-        # Get notes from PocketBase
-        from helper.pocketbase_helper import get_pb_admin_client
-        admin_pb = get_pb_admin_client()
-        notes = admin_pb.collection('notes').get_list(1, 100, {
-            "filter": filter_string,
-            "sort": "-updated"  # Sort by most recently updated first
+        filter_string = pb_filter(" && ".join(filter_conditions), {
+            "user_id": user.id, "search": search, "tag": tag, "favorite": favorite
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Get notes from PocketBase
+    from helper.pocketbase_helper import get_pb_admin_client
+    admin_pb = await run_in_threadpool(get_pb_admin_client)
+    notes = await run_in_threadpool(admin_pb.collection('notes').get_list, 1, 100, {
+        "filter": filter_string,
+        "sort": "-updated"  # Sort by most recently updated first
+    })
+    
+    # Convert to response format
+    notes_list = []
+    for note in notes.items:
+        notes_list.append({
+            "id": note.id,
+            "title": getattr(note, 'title', ''),
+            "content": getattr(note, 'content', ''),
+            "tags": getattr(note, 'tags', []),
+            "is_favorite": getattr(note, 'is_favorite', False),
+            "created": getattr(note, 'created', ''),
+            "updated": getattr(note, 'updated', '')
         })
-        
-        # Convert to response format
-        notes_list = []
-        for note in notes.items:
-            notes_list.append({
-                "id": note.id,
-                "title": getattr(note, 'title', ''),
-                "content": getattr(note, 'content', ''),
-                "tags": getattr(note, 'tags', []),
-                "is_favorite": getattr(note, 'is_favorite', False),
-                "created": getattr(note, 'created', ''),
-                "updated": getattr(note, 'updated', '')
-            })
-        
-        return {"success": True, "notes": notes_list}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting notes: {str(e)}")
+    
+    return {"success": True, "notes": notes_list}
 
 @router.get("/api/user/notes/{note_id}")
 async def get_note(request: Request, note_id: str):
     """Get a specific note by ID."""
-    try:
-        user = get_current_user(request)
-        if not user:
-            raise HTTPException(status_code=401, detail="Not authenticated")
-        
-        # Get note from PocketBase
-        from helper.pocketbase_helper import get_pb_admin_client
-        admin_pb = get_pb_admin_client()
-        note = admin_pb.collection('notes').get_one(note_id)
-        
-        # Check if note belongs to user
-        if getattr(note, 'user_id', '') != user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        return {
-            "success": True,
-            "note": {
-                "id": note.id,
-                "title": getattr(note, 'title', ''),
-                "content": getattr(note, 'content', ''),
-                "tags": getattr(note, 'tags', []),
-                "is_favorite": getattr(note, 'is_favorite', False),
-                "created": getattr(note, 'created', ''),
-                "updated": getattr(note, 'updated', '')
-            }
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    # Get note from PocketBase
+    from helper.pocketbase_helper import get_pb_admin_client
+    admin_pb = await run_in_threadpool(get_pb_admin_client)
+    note = await run_in_threadpool(admin_pb.collection('notes').get_one, note_id)
+    
+    # Check if note belongs to user
+    if getattr(note, 'user_id', '') != user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return {
+        "success": True,
+        "note": {
+            "id": note.id,
+            "title": getattr(note, 'title', ''),
+            "content": getattr(note, 'content', ''),
+            "tags": getattr(note, 'tags', []),
+            "is_favorite": getattr(note, 'is_favorite', False),
+            "created": getattr(note, 'created', ''),
+            "updated": getattr(note, 'updated', '')
         }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting note: {str(e)}")
+    }
 
 @router.post("/api/user/notes")
 async def create_note(request: Request, note_data: NoteCreate):
     """Create a new note."""
-    try:
-        user = get_current_user(request)
-        if not user:
-            raise HTTPException(status_code=401, detail="Not authenticated")
-        
-        # Create note in PocketBase
-        from helper.pocketbase_helper import get_pb_admin_client
-        admin_pb = get_pb_admin_client()
-        
-        # Ensure tags are lowercase
-        lowercase_tags = [tag.lower() for tag in note_data.tags] if note_data.tags else []
-        
-        note = admin_pb.collection('notes').create({
-            "user_id": user.id,
-            "title": note_data.title,
-            "content": note_data.content,
-            "tags": lowercase_tags,
-            "is_favorite": note_data.is_favorite
-        })
-        
-        return {
-            "success": True,
-            "message": "Note created successfully",
-            "note": {
-                "id": note.id,
-                "title": getattr(note, 'title', ''),
-                "content": getattr(note, 'content', ''),
-                "tags": getattr(note, 'tags', []),
-                "is_favorite": getattr(note, 'is_favorite', False),
-                "created": getattr(note, 'created', ''),
-                "updated": getattr(note, 'updated', '')
-            }
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    # Create note in PocketBase
+    from helper.pocketbase_helper import get_pb_admin_client
+    admin_pb = await run_in_threadpool(get_pb_admin_client)
+    
+    # Ensure tags are lowercase
+    lowercase_tags = [tag.lower() for tag in note_data.tags] if note_data.tags else []
+    
+    note = await run_in_threadpool(admin_pb.collection('notes').create, {
+        "user_id": user.id,
+        "title": note_data.title,
+        "content": note_data.content,
+        "tags": lowercase_tags,
+        "is_favorite": note_data.is_favorite
+    })
+    
+    return {
+        "success": True,
+        "message": "Note created successfully",
+        "note": {
+            "id": note.id,
+            "title": getattr(note, 'title', ''),
+            "content": getattr(note, 'content', ''),
+            "tags": getattr(note, 'tags', []),
+            "is_favorite": getattr(note, 'is_favorite', False),
+            "created": getattr(note, 'created', ''),
+            "updated": getattr(note, 'updated', '')
         }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error creating note: {str(e)}")
+    }
 
 @router.put("/api/user/notes/{note_id}")
 async def update_note(request: Request, note_id: str, note_data: NoteUpdate):
     """Update an existing note."""
-    try:
-        user = get_current_user(request)
-        if not user:
-            raise HTTPException(status_code=401, detail="Not authenticated")
-        
-        # Check if note exists and belongs to user
-        from helper.pocketbase_helper import get_pb_admin_client
-        admin_pb = get_pb_admin_client()
-        existing_note = admin_pb.collection('notes').get_one(note_id)
-        if getattr(existing_note, 'user_id', '') != user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        # Build update data (only include fields that are provided)
-        update_data = {}
-        if note_data.title is not None:
-            update_data["title"] = note_data.title
-        if note_data.content is not None:
-            update_data["content"] = note_data.content
-        if note_data.tags is not None:
-            # Ensure tags are lowercase
-            update_data["tags"] = [tag.lower() for tag in note_data.tags]
-        if note_data.is_favorite is not None:
-            update_data["is_favorite"] = note_data.is_favorite
-        
-        # Update note in PocketBase
-        updated_note = admin_pb.collection('notes').update(note_id, update_data)
-        
-        return {
-            "success": True,
-            "message": "Note updated successfully",
-            "note": {
-                "id": updated_note.id,
-                "title": getattr(updated_note, 'title', ''),
-                "content": getattr(updated_note, 'content', ''),
-                "tags": getattr(updated_note, 'tags', []),
-                "is_favorite": getattr(updated_note, 'is_favorite', False),
-                "created": getattr(updated_note, 'created', ''),
-                "updated": getattr(updated_note, 'updated', '')
-            }
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    # Check if note exists and belongs to user
+    from helper.pocketbase_helper import get_pb_admin_client
+    admin_pb = await run_in_threadpool(get_pb_admin_client)
+    existing_note = await run_in_threadpool(admin_pb.collection('notes').get_one, note_id)
+    if getattr(existing_note, 'user_id', '') != user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    # Build update data (only include fields that are provided)
+    update_data = {}
+    if note_data.title is not None:
+        update_data["title"] = note_data.title
+    if note_data.content is not None:
+        update_data["content"] = note_data.content
+    if note_data.tags is not None:
+        # Ensure tags are lowercase
+        update_data["tags"] = [tag.lower() for tag in note_data.tags]
+    if note_data.is_favorite is not None:
+        update_data["is_favorite"] = note_data.is_favorite
+    
+    # Update note in PocketBase
+    updated_note = await run_in_threadpool(admin_pb.collection('notes').update, note_id, update_data)
+    
+    return {
+        "success": True,
+        "message": "Note updated successfully",
+        "note": {
+            "id": updated_note.id,
+            "title": getattr(updated_note, 'title', ''),
+            "content": getattr(updated_note, 'content', ''),
+            "tags": getattr(updated_note, 'tags', []),
+            "is_favorite": getattr(updated_note, 'is_favorite', False),
+            "created": getattr(updated_note, 'created', ''),
+            "updated": getattr(updated_note, 'updated', '')
         }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error updating note: {str(e)}")
+    }
 
 @router.delete("/api/user/notes/{note_id}")
 async def delete_note(request: Request, note_id: str):
     """Delete a note."""
-    try:
-        user = get_current_user(request)
-        if not user:
-            raise HTTPException(status_code=401, detail="Not authenticated")
-        
-        # Check if note exists and belongs to user
-        from helper.pocketbase_helper import get_pb_admin_client
-        admin_pb = get_pb_admin_client()
-        existing_note = admin_pb.collection('notes').get_one(note_id)
-        if getattr(existing_note, 'user_id', '') != user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        # Delete note from PocketBase
-        admin_pb.collection('notes').delete(note_id)
-        
-        return {
-            "success": True,
-            "message": "Note deleted successfully"
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error deleting note: {str(e)}")
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    # Check if note exists and belongs to user
+    from helper.pocketbase_helper import get_pb_admin_client
+    admin_pb = await run_in_threadpool(get_pb_admin_client)
+    existing_note = await run_in_threadpool(admin_pb.collection('notes').get_one, note_id)
+    if getattr(existing_note, 'user_id', '') != user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    # Delete note from PocketBase
+    await run_in_threadpool(admin_pb.collection('notes').delete, note_id)
+    
+    return {
+        "success": True,
+        "message": "Note deleted successfully"
+    }
 
 @router.get("/api/user/tags")
 async def get_user_tags(request: Request):
     """Get all unique tags used by the current user."""
     # try:
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
     # Get all notes for the user
     from helper.pocketbase_helper import get_pb_admin_client
-    admin_pb = get_pb_admin_client()
+    admin_pb = await run_in_threadpool(get_pb_admin_client)
     
     # Use a larger page size to get all notes, or implement pagination
-    notes = admin_pb.collection('notes').get_list(1, 500, {
-        "filter": f"user_id = '{user.id}'"
+    notes = await run_in_threadpool(admin_pb.collection('notes').get_list, 1, 500, {
+        "filter": pb_filter("user_id = {:user_id}", {"user_id": user.id})
     })
     
     # Collect all unique tags
@@ -0,0 +1,39 @@
+from fastapi import Request, APIRouter
+from fastapi.responses import HTMLResponse, Response
+from deps import render_template
+from helper.helper import get_kuzu_manager
+from helper.roadmap_helper import get_cached_roadmap_flat, get_cached_roadmap_progression
+
+router = APIRouter(
+    prefix="",
+    tags=["Roadmap"],
+)
+
+def _etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """Return 304 when the client already holds this ETag, otherwise the JSON body."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/api/roadmap-progression", response_model=None)
+async def get_roadmap_progression(request: Request):
+    """Get skills organized in roadmap progression levels"""
+    manager = get_kuzu_manager()
+    body, etag = get_cached_roadmap_progression(request.app.state, manager)
+    return _etag_response(request, body, etag)
+
+@router.get("/api/roadmap-flat", response_model=None)
+async def get_roadmap_flat(request: Request):
+    """Get a flat skills graph (no levels) for comparison with progression layout."""
+    manager = get_kuzu_manager()
+    body, etag = get_cached_roadmap_flat(request.app.state, manager)
+    return _etag_response(request, body, etag)
+
+@router.get("/roadmap/progression", response_class=HTMLResponse)
+async def roadmap_progression_page(request: Request):
+    """Roadmap progression visualization page"""
+    return render_template("roadmap_progression.html", {
+        "request": request,
+        "title": "Roadmap"
+    })
@@ -1,39 +1,43 @@
-from fastapi import Request, HTTPException, APIRouter
-from helper.user_progress_helper import UserProgressHelper
+from fastapi import Request, HTTPException, APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+import deps
+from helper.user_progress_helper import get_progress_helper
 from helper.helper import get_current_user
+from schemas.progress import (
+    StartLearningTrack,
+    ProgressUpdate,
+    LearningNodeCompletion,
+    LearningNodeIncomplete,
+    LearningNodeCompletionBatch,
+)
 
 router = APIRouter(
     prefix="",
     tags=["Roadmap Progress"],
 )
 
+# Upper bound for per_page on paginated progress reads (PocketBase rejects larger pages)
+MAX_PER_PAGE = 500
+
+
 @router.post("/api/route-planning/start-learning")
-async def start_learning_track(request: Request, track_data: dict):
+async def start_learning_track(request: Request, track_data: StartLearningTrack):
     """Save user's learning track when they click 'Start Learning'"""
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    # try:
-    # Extract track information from the request
-    start_skill = track_data.get("start_skill")
-    target_skill = track_data.get("target_skill")
-    skill_path = track_data.get("skill_path", [])
-    
-    if not start_skill or not target_skill or not skill_path:
-        raise HTTPException(status_code=400, detail="Missing required track data")
-    
-    from helper.pocketbase_helper import get_pb_admin_client
-    pb = get_pb_admin_client()
-    progress_helper = UserProgressHelper(pb)
+    progress_helper = await run_in_threadpool(get_progress_helper)
     
     # Save the user's roadmap path
-    result = progress_helper.save_user_roadmap_path(
+    result = await run_in_threadpool(
+        progress_helper.save_user_roadmap_path,
         user_id=user.id,
-        start_skill=start_skill,
-        target_skill=target_skill,
-        skill_path=skill_path
+        start_skill=track_data.start_skill,
+        target_skill=track_data.target_skill,
+        skill_path=track_data.skill_path
     )
+    deps.invalidate_progress(user.id)
     
     return {
         "success": True,
@@ -47,146 +51,142 @@ async def start_learning_track(request: Request, track_data: dict):
 @router.get("/api/user/progress")
 async def get_user_progress(request: Request):
     """Get user's learning progress"""
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    try:
+    views = deps.progress_views(user.id)
+    user_paths = views.get("paths")
+    if user_paths is None:
         # Use admin client for reading user progress
-        from helper.pocketbase_helper import get_pb_admin_client
-        pb = get_pb_admin_client()
-        progress_helper = UserProgressHelper(pb)
-        user_paths = progress_helper.get_user_roadmap_paths(user.id)
-        
-        return {
-            "success": True,
-            "user_paths": user_paths
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get user progress: {str(e)}")
+        progress_helper = await run_in_threadpool(get_progress_helper)
+        user_paths = await run_in_threadpool(progress_helper.get_user_roadmap_paths, user.id)
+        # get_user_roadmap_paths returns [] on errors; don't pin that
+        if user_paths:
+            views["paths"] = user_paths
+    
+    return {
+        "success": True,
+        "user_paths": user_paths
+    }
 
 @router.post("/api/user/progress/update")
-async def update_user_progress(request: Request, progress_data: dict):
+async def update_user_progress(request: Request, progress_data: ProgressUpdate):
     """Update user's progress on a learning path"""
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    try:
-        user_roadmap_path_id = progress_data.get("user_roadmap_path_id")
-        progress = progress_data.get("progress", 0.0)
-        completed_at = progress_data.get("completed_at")
-        
-        if not user_roadmap_path_id:
-            raise HTTPException(status_code=400, detail="Missing user_roadmap_path_id")
-        
-        from helper.pocketbase_helper import get_pb_admin_client
-        pb = get_pb_admin_client()
-        progress_helper = UserProgressHelper(pb)
-        result = progress_helper.update_user_progress(
-            user_roadmap_path_id=user_roadmap_path_id,
-            progress=progress,
-            completed_at=completed_at
-        )
-        
-        return {
-            "success": True,
-            "message": "Progress updated successfully",
-            "data": result
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to update progress: {str(e)}")
+    progress_helper = await run_in_threadpool(get_progress_helper)
+    result = await run_in_threadpool(
+        progress_helper.update_user_progress,
+        user_roadmap_path_id=progress_data.user_roadmap_path_id,
+        progress=progress_data.progress,
+        completed_at=progress_data.completed_at
+    )
+    deps.invalidate_progress(user.id)
+    
+    return {
+        "success": True,
+        "message": "Progress updated successfully",
+        "data": result
+    }
 
 @router.post("/api/learning-node/complete")
-async def complete_learning_node(request: Request, completion_data: dict):
+async def complete_learning_node(request: Request, completion_data: LearningNodeCompletion):
     """Mark a learning node as completed"""
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    try:
-        learning_node_id = completion_data.get("learning_node_id")
-        skill_id = completion_data.get("skill_id")
-        user_roadmap_path_id = completion_data.get("user_roadmap_path_id")
-        completed_at = completion_data.get("completed_at")
-        
-        if not learning_node_id or not skill_id or not user_roadmap_path_id:
-            raise HTTPException(status_code=400, detail="Missing required fields: learning_node_id, skill_id, user_roadmap_path_id")
-        
-        from helper.pocketbase_helper import get_pb_admin_client
-        pb = get_pb_admin_client()
-        progress_helper = UserProgressHelper(pb)
-        result = progress_helper.save_learning_node_completion(
-            user_id=user.id,
-            learning_node_id=learning_node_id,
-            skill_id=skill_id,
-            user_roadmap_path_id=user_roadmap_path_id,
-            completed_at=completed_at
-        )
-        
-        return {
-            "success": True,
-            "message": f"Learning node {result['action']} successfully",
-            "data": result
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to complete learning node: {str(e)}")
+    progress_helper = await run_in_threadpool(get_progress_helper)
+    result = await run_in_threadpool(
+        progress_helper.save_learning_node_completion,
+        user_id=user.id,
+        learning_node_id=completion_data.learning_node_id,
+        skill_id=completion_data.skill_id,
+        user_roadmap_path_id=completion_data.user_roadmap_path_id,
+        completed_at=completion_data.completed_at
+    )
+    deps.invalidate_progress(user.id)
+    
+    return {
+        "success": True,
+        "message": f"Learning node {result['action']} successfully",
+        "data": result
+    }
+
+@router.post("/api/learning-node/complete-batch")
+async def complete_learning_nodes_batch(request: Request, batch: LearningNodeCompletionBatch):
+    """Mark several learning nodes as completed in one request"""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    progress_helper = await run_in_threadpool(get_progress_helper)
+    result = await run_in_threadpool(
+        progress_helper.save_learning_node_completions_bulk,
+        user_roadmap_path_id=batch.user_roadmap_path_id,
+        nodes=[node.model_dump() for node in batch.nodes]
+    )
+    deps.invalidate_progress(user.id)
+    
+    return {
+        "success": True,
+        "message": f"{result['created']} created, {result['updated']} updated",
+        "data": result
+    }
 
 @router.post("/api/learning-node/incomplete")
-async def incomplete_learning_node(request: Request, completion_data: dict):
+async def incomplete_learning_node(request: Request, completion_data: LearningNodeIncomplete):
     """Mark a learning node as incomplete (remove completion)"""
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    try:
-        learning_node_id = completion_data.get("learning_node_id")
-        user_roadmap_path_id = completion_data.get("user_roadmap_path_id")
-        
-        if not learning_node_id or not user_roadmap_path_id:
-            raise HTTPException(status_code=400, detail="Missing required fields: learning_node_id, user_roadmap_path_id")
-        from helper.pocketbase_helper import get_pb_admin_client
-        pb = get_pb_admin_client()
-        progress_helper = UserProgressHelper(pb)
-        result = progress_helper.remove_learning_node_completion(
-            user_id=user.id,
-            learning_node_id=learning_node_id,
-            user_roadmap_path_id=user_roadmap_path_id
-        )
-        
-        return {
-            "success": True,
-            "message": f"Learning node {result['action']} successfully",
-            "data": result
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to mark learning node incomplete: {str(e)}")
+    progress_helper = await run_in_threadpool(get_progress_helper)
+    result = await run_in_threadpool(
+        progress_helper.remove_learning_node_completion,
+        user_id=user.id,
+        learning_node_id=completion_data.learning_node_id,
+        user_roadmap_path_id=completion_data.user_roadmap_path_id
+    )
+    deps.invalidate_progress(user.id)
+    
+    return {
+        "success": True,
+        "message": f"Learning node {result['action']} successfully",
+        "data": result
+    }
 
 @router.get("/api/learning-node/progress")
-async def get_learning_node_progress(request: Request, user_roadmap_path_id: str = None):
+async def get_learning_node_progress(request: Request, user_roadmap_path_id: str = None,
+                                     page: int = Query(None, ge=1),
+                                     per_page: int = Query(None, ge=1, le=MAX_PER_PAGE)):
     """Get user's learning node progress"""
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    try:
-        from helper.pocketbase_helper import get_pb_admin_client
-        pb = get_pb_admin_client()
-        progress_helper = UserProgressHelper(pb)
-        progress_records = progress_helper.get_user_learning_node_progress(
+    # Only the unpaginated view is cached; page/per_page combinations would multiply the entries
+    paginated = page is not None or per_page is not None
+    views = deps.progress_views(user.id)
+    view_key = ("nodes", user_roadmap_path_id)
+    progress_records = None if paginated else views.get(view_key)
+    if progress_records is None:
+        progress_helper = await run_in_threadpool(get_progress_helper)
+        progress_records = await run_in_threadpool(
+            progress_helper.get_user_learning_node_progress,
             user_id=user.id,
-            user_roadmap_path_id=user_roadmap_path_id
+            user_roadmap_path_id=user_roadmap_path_id,
+            page=page,
+            per_page=per_page
         )
-        
-        return {
-            "success": True,
-            "progress_records": progress_records,
-            "total_completed": len(progress_records)
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get learning node progress: {str(e)}")
+        if not paginated:
+            deps.store_progress_view(views, view_key, progress_records)
+    
+    return {
+        "success": True,
+        "progress_records": progress_records,
+        "total_completed": len(progress_records)
+    }
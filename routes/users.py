@@ -1,10 +1,18 @@
-from fastapi import Request, HTTPException, APIRouter
+import asyncio
+import logging
+import httpx
+from types import SimpleNamespace
+from fastapi import Request, HTTPException, APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse, HTMLResponse
 from config import app_config
 from schemas.user import UserSignup, UserLogin
-from deps import templates
-from helper.helper import get_current_user
-from helper.pocketbase_helper import get_pb_admin_client
+import deps
+from deps import render_template
+from helper.helper import get_current_user, invalidate_cached_user, require_authenticated_user
+from helper.pocketbase_helper import get_pb_admin_client, pb_filter
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="",
@@ -16,11 +24,11 @@ router = APIRouter(
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
     """Login page"""
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if user:
         return RedirectResponse(url=f"{app_config.url_prefix}/", status_code=302)
     
-    return templates.TemplateResponse("auth/login.html", {
+    return render_template("auth/login.html", {
         "request": request,
         "title": "Login"
     })
@@ -28,11 +36,11 @@ async def login_page(request: Request):
 @router.get("/signup", response_class=HTMLResponse)
 async def signup_page(request: Request):
     """Signup page"""
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if user:
         return RedirectResponse(url=f"{app_config.url_prefix}/", status_code=302)
     
-    return templates.TemplateResponse("auth/signup.html", {
+    return render_template("auth/signup.html", {
         "request": request,
         "title": "Sign Up"
     })
@@ -47,13 +55,25 @@ async def signup(user_data: UserSignup):
     
     # Create user in PocketBase (let PocketBase handle password hashing)
     # For auth collections, we need to include passwordConfirm
-    pb = get_pb_admin_client()
-    user = pb.collection('users').create({
-        "email": user_data.email,
-        "password": user_data.password,
-        "passwordConfirm": user_data.passwordConfirm,
-        "name": user_data.name
-    })
+    admin_pb = await run_in_threadpool(get_pb_admin_client)
+    resp = await deps.pb_http.post(
+        "/api/collections/users/records",
+        json={
+            "email": user_data.email,
+            "password": user_data.password,
+            "passwordConfirm": user_data.passwordConfirm,
+            "name": user_data.name
+        },
+        headers={"Authorization": admin_pb.auth_store.token}
+    )
+    if resp.status_code >= 400:
+        try:
+            message = resp.json().get('message', resp.text)
+        except ValueError:
+            # Proxies and PocketBase crashes can answer with a non-JSON body
+            message = resp.text
+        raise HTTPException(status_code=400, detail=f"Signup failed: {message}")
+    user = SimpleNamespace(**resp.json())
     
     return {
         "success": True,
@@ -70,94 +90,80 @@ async def signup(user_data: UserSignup):
 @router.post("/api/auth/login")
 async def login(user_data: UserLogin, request: Request):
     """User login endpoint"""
+    # Use PocketBase's built-in authentication over the shared keep-alive client
     try:
-        pb = get_pb_admin_client()
-        # First check if user exists
-        try:
-            users = pb.collection('users').get_list(1, 1, {
-                "filter": f"email = '{user_data.email}'"
-            })
-            if not users.items:
-                raise HTTPException(status_code=401, detail="Invalid email or password")
-        except Exception:
-            raise HTTPException(status_code=401, detail="Invalid email or password")
-        
-        # Use PocketBase's built-in authentication
-        auth_data = pb.collection('users').auth_with_password(
-            user_data.email,
-            user_data.password
+        resp = await deps.pb_http.post(
+            "/api/collections/users/auth-with-password",
+            json={"identity": user_data.email, "password": user_data.password}
         )
-        
-        # Create response with cookie
-        from fastapi.responses import JSONResponse
-        response = JSONResponse({
-            "success": True,
-            "message": "Login successful",
-            "user": {
-                "id": auth_data.record.id,
-                "email": auth_data.record.email,
-                "name": auth_data.record.name
-            },
-            "token": auth_data.token
-        })
-        
-        # Set the auth token as an HTTP-only cookie
-        response.set_cookie(
-            key="auth_token",
-            value=auth_data.token,
-            max_age=7 * 24 * 60 * 60,  # 7 days
-            httponly=True,
-            secure=False,  # Set to True in production with HTTPS
-            samesite="lax"
-        )
-        
-        return response
-    except HTTPException:
-        raise
-    except Exception as e:
-        # Handle PocketBase authentication errors gracefully
-        error_message = str(e)
-        print(f"Login error: {error_message}")  # Debug logging
-        
-        # Check if it's a PocketBase authentication error
-        if "Failed to authenticate" in error_message or "Status code:400" in error_message:
-            raise HTTPException(status_code=401, detail="Invalid email or password")
-        elif "email" in error_message.lower():
-            raise HTTPException(status_code=401, detail="Invalid email address")
-        elif "password" in error_message.lower():
-            raise HTTPException(status_code=401, detail="Invalid password")
-        else:
-            raise HTTPException(status_code=401, detail="Login failed. Please check your credentials and try again.")
+    except httpx.HTTPError as e:
+        logger.warning("Login request to PocketBase failed: %s", e)
+        raise HTTPException(status_code=503, detail="Authentication service unavailable")
+    # PocketBase answers 400 for both unknown emails and wrong passwords
+    if resp.status_code == 400:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    if resp.status_code >= 400:
+        logger.warning("PocketBase login returned status %s", resp.status_code)
+        raise HTTPException(status_code=502, detail="Authentication service error")
+    try:
+        payload = resp.json()
+        auth_data = SimpleNamespace(token=payload["token"], record=SimpleNamespace(**payload["record"]))
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning("Unexpected PocketBase login response: %s", e)
+        raise HTTPException(status_code=502, detail="Authentication service error")
+    
+    # Create response with cookie
+    from fastapi.responses import JSONResponse
+    response = JSONResponse({
+        "success": True,
+        "message": "Login successful",
+        "user": {
+            "id": auth_data.record.id,
+            "email": auth_data.record.email,
+            "name": auth_data.record.name
+        },
+        "token": auth_data.token
+    })
+    
+    # Set the auth token as an HTTP-only cookie
+    response.set_cookie(
+        key="auth_token",
+        value=auth_data.token,
+        max_age=7 * 24 * 60 * 60,  # 7 days
+        httponly=True,
+        secure=False,  # Set to True in production with HTTPS
+        samesite="lax"
+    )
+    
+    return response
 
 @router.post("/api/auth/logout")
-async def logout():
+async def logout(request: Request):
     """User logout endpoint"""
-    try:
-        pb = get_pb_admin_client()
-        pb.auth_store.clear()
-        
-        # Create response and clear the cookie
-        from fastapi.responses import JSONResponse
-        response = JSONResponse({
-            "success": True, 
-            "message": "Logout successful"
-        })
-        
-        # Clear the auth token cookie
-        response.delete_cookie(
-            key="auth_token",
-            httponly=True,
-            samesite="lax"
-        )
-        
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Logout failed: {str(e)}")
+    token = request.cookies.get("auth_token")
+    if token:
+        await invalidate_cached_user(token)
+    
+    # Create response and clear the cookie
+    from fastapi.responses import JSONResponse
+    response = JSONResponse({
+        "success": True, 
+        "message": "Logout successful"
+    })
+    
+    # Clear the auth token cookie
+    response.delete_cookie(
+        key="auth_token",
+        httponly=True,
+        samesite="lax"
+    )
+    
+    return response
 
 @router.get("/api/auth/me")
 async def get_current_user_info(request: Request):
     """Get current user information"""
-    user = get_current_user(request)
+    user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
@@ -171,21 +177,29 @@ async def get_current_user_info(request: Request):
     }
 
 @router.get("/profile", response_class=HTMLResponse)
-async def profile_page(request: Request):
+async def profile_page(request: Request, user=Depends(require_authenticated_user)):
     """Profile page"""
-    user = get_current_user(request)
-    if not user:
-        return RedirectResponse(url=f"{app_config.url_prefix}/login", status_code=302)
-    
     # Gather user statistics
     try:
         from helper.pocketbase_helper import get_pb_admin_client
-        admin_pb = get_pb_admin_client()
+        admin_pb = await run_in_threadpool(get_pb_admin_client)
+        
+        # Notes and roadmaps are independent; fetch them concurrently
+        notes, roadmaps = await asyncio.gather(
+            run_in_threadpool(admin_pb.collection('notes').get_list, 1, 500, {
+                "filter": pb_filter("user_id = {:user_id}", {"user_id": user.id})
+            }),
+            # Only the count is needed: one id-only row plus totalItems
+            run_in_threadpool(admin_pb.collection('user_roadmap_path').get_list, 1, 1, {
+                "filter": pb_filter("user_id = {:user_id}", {"user_id": user.id}),
+                "fields": "id"
+            }),
+            return_exceptions=True
+        )
+        if isinstance(notes, Exception):
+            raise notes
         
         # Get notes count
-        notes = admin_pb.collection('notes').get_list(1, 500, {
-            "filter": f"user_id = '{user.id}'"
-        })
         notes_count = len(notes.items)
         
         # Get favorite notes count
@@ -210,14 +224,11 @@ async def profile_page(request: Request):
         tags_count = len(all_tags)
         
         # Get roadmaps count from user_roadmap_path table
-        try:
-            roadmaps = admin_pb.collection('user_roadmap_path').get_list(1, 500, {
-                "filter": f"user_id = '{user.id}'"
-            })
-            roadmaps_count = len(roadmaps.items)
-        except Exception as e:
-            print(f"Error getting roadmaps count: {e}")
+        if isinstance(roadmaps, Exception):
+            logger.warning("Error getting roadmaps count: %s", roadmaps)
             roadmaps_count = 0
+        else:
+            roadmaps_count = roadmaps.total_items
         
         # Prepare user data with statistics
         user_data = {
@@ -236,7 +247,7 @@ async def profile_page(request: Request):
         }
         
     except Exception as e:
-        print(f"Error gathering user statistics: {e}")
+        logger.warning("Error gathering user statistics: %s", e)
         # Fallback with basic user data
         user_data = {
             "id": user.id,
@@ -253,7 +264,7 @@ async def profile_page(request: Request):
             }
         }
     
-    return templates.TemplateResponse("profile_content.html", {
+    return render_template("profile_content.html", {
         "request": request,
         "title": "Profile",
         "user": user_data
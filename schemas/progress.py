@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+# Roadmap progress models
+class StartLearningTrack(BaseModel):
+    start_skill: str = Field(min_length=1)
+    target_skill: str = Field(min_length=1)
+    skill_path: List[Dict[str, Any]] = Field(min_length=1)
+
+class ProgressUpdate(BaseModel):
+    user_roadmap_path_id: str = Field(min_length=1)
+    progress: float = 0.0
+    completed_at: Optional[str] = None
+
+# Learning node progress models
+class LearningNodeCompletion(BaseModel):
+    learning_node_id: str = Field(min_length=1)
+    skill_id: str = Field(min_length=1)
+    user_roadmap_path_id: str = Field(min_length=1)
+    completed_at: Optional[str] = None
+
+class LearningNodeIncomplete(BaseModel):
+    learning_node_id: str = Field(min_length=1)
+    user_roadmap_path_id: str = Field(min_length=1)
+
+class LearningNodeCompletionItem(BaseModel):
+    learning_node_id: str = Field(min_length=1)
+    skill_id: str = Field(min_length=1)
+    completed_at: Optional[str] = None
+
+class LearningNodeCompletionBatch(BaseModel):
+    user_roadmap_path_id: str = Field(min_length=1)
+    # Capped at one PocketBase batch request (BATCH_MAX_REQUESTS)
+    nodes: List[LearningNodeCompletionItem] = Field(min_length=1, max_length=50)